@@ -0,0 +1,207 @@
+"""
+End-to-end export benchmark against the local mock server.
+
+Runs full exports (first page, list pages and manga details, JSON and CSV
+files) of one or more generated manga lists and reports entries/sec, wall
+time per phase and peak RSS. With --cli the exports go through the batch
+command in a separate process instead, so the numbers include CLI start up.
+
+    python benchmarks/bench_export.py
+    python benchmarks/bench_export.py --lists 3 --pages 20 --latency 0.05 --workers 16
+    python benchmarks/bench_export.py --error-rate 0.05 --cache --runs 2
+    python benchmarks/bench_export.py --cli --workers 8
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from mock_server import MockServerConfig, start_mock_server
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+PHASES = ("first page", "list pages and details", "export")
+
+sys.path.insert(0, str(ROOT_PATH))
+
+def peak_rss_mib(who: int = resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_in_process(args, codes: List[str], path: Path) -> dict:
+    # Imported once the mock server is up, the parser reads MANGAGO_BASE_URL on import
+    from src.cache import MangaCache
+    from src.exporter import export_manga_list_to_csv, export_manga_list_to_json
+    from src.fetcher import create_fetcher
+    from src.parser import get_manga_list_url, make_soup, parse_manga_list_entries, parse_manga_list_info
+    from src.pipeline import create_parse_executor, export_manga_list_pipelined
+    from src.scheduler import RequestScheduler, ScheduledFetcher
+
+    phases = {phase: 0.0 for phase in PHASES}
+    entries = 0
+    failed = 0
+    cache = MangaCache(path / "cache.sqlite3") if args.cache else None
+    fetcher = ScheduledFetcher(
+        create_fetcher("http", size=args.workers + (args.page_workers or args.workers)),
+        RequestScheduler(rate=args.rate),
+        max_retries=args.max_retries,
+    )
+    # One pool for every list, like the CLI
+    parse_executor = create_parse_executor(args.parse_workers) if args.parse_workers > 0 else None
+
+    start = time.perf_counter()
+    for code in codes:
+        phase_start = time.perf_counter()
+        url = get_manga_list_url(code, 1)
+        soup = make_soup(fetcher.fetch(url), args.parser)
+        manga_list = parse_manga_list_info(soup)
+        manga_list.url = url
+        manga_list.entries = parse_manga_list_entries(soup)
+        phases["first page"] += time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        export_manga_list_pipelined(
+            fetcher,
+            manga_list,
+            code,
+            workers=args.workers,
+            page_workers=args.page_workers,
+            cache=cache,
+            parser=args.parser,
+            parse_executor=parse_executor,
+            on_page_error=lambda page, e: None,
+            on_entry_error=lambda manga_list_entry, e: None,
+        )
+        phases["list pages and details"] += time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        export_manga_list_to_json(manga_list, str(path))
+        export_manga_list_to_csv(manga_list, str(path))
+        phases["export"] += time.perf_counter() - phase_start
+
+        entries += len(manga_list.entries)
+        failed += sum(1 for manga_list_entry in manga_list.entries if manga_list_entry.manga is None)
+    elapsed = time.perf_counter() - start
+
+    fetcher.close()
+    if cache is not None:
+        cache.close()
+    if parse_executor is not None:
+        parse_executor.shutdown()
+
+    return {
+        "entries": entries,
+        "failed_entries": failed,
+        "wall_s": elapsed,
+        "entries_per_sec": entries / elapsed,
+        "phases_s": phases,
+        "requests": str(fetcher.scheduler.stats),
+        # Includes the mock server, which runs in the same process
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+def run_cli(args, codes: List[str], path: Path, base_url: str) -> dict:
+    for folder in ("json", "csv"):
+        (path / "saves" / folder).mkdir(parents=True, exist_ok=True)
+    codes_file = path / "codes.txt"
+    codes_file.write_text("\n".join(codes) + "\n")
+
+    command = [
+        sys.executable, "-m", "cli.main",
+        "--backend", "http",
+        "--workers", str(args.workers),
+        "--rate", str(args.rate),
+        "--max-retries", str(args.max_retries),
+        "--parser", args.parser,
+        "--parse-workers", str(args.parse_workers),
+        "--cache" if args.cache else "--no-cache",
+    ]
+    if args.page_workers:
+        command += ["--page-workers", str(args.page_workers)]
+    command += ["batch", str(codes_file), "--format", "json", "--format", "csv"]
+
+    env = dict(os.environ, MANGAGO_BASE_URL=base_url, PYTHONPATH=str(ROOT_PATH))
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=path, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        print(completed.stdout[-2000:], file=sys.stderr)
+
+    entries = len(codes) * args.pages * args.entries
+    return {
+        "entries": entries,
+        "exit_code": completed.returncode,
+        "wall_s": elapsed,
+        "entries_per_sec": entries / elapsed,
+        "peak_rss_mib": peak_rss_mib(resource.RUSAGE_CHILDREN),
+    }
+
+def print_report(runs: List[dict], server_stats: str):
+    for index, result in enumerate(runs, start=1):
+        print(f"\n== run {index}: {result['entries']} entries in {result['wall_s']:.2f}s, {result['entries_per_sec']:.1f} entries/sec, peak RSS {result['peak_rss_mib']:.1f} MiB")
+        for phase, seconds in result.get("phases_s", {}).items():
+            print(f"{phase:<28}{seconds:>10.3f}s")
+        if "requests" in result:
+            print(f"Requests: {result['requests']}")
+        if result.get("failed_entries"):
+            print(f"Failed entries: {result['failed_entries']}")
+        if result.get("exit_code"):
+            print(f"CLI exited with status {result['exit_code']}")
+    print(f"\nServer: {server_stats}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark full exports against a local mock Mangago server.")
+    parser.add_argument("--lists", type=int, default=1, help="Manga lists exported per run.")
+    parser.add_argument("--pages", type=int, default=5, help="List pages per manga list.")
+    parser.add_argument("--entries", type=int, default=30, help="Entries per list page.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds the server waits before every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds per response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses failing with HTTP 503.")
+    parser.add_argument("--shared", type=float, default=0.0, help="Share of entries pointing to manga present on every list.")
+    parser.add_argument("--workers", type=int, default=4, help="Manga pages fetched concurrently.")
+    parser.add_argument("--page-workers", type=int, help="List pages fetched concurrently. Defaults to --workers.")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Processes parsing pages in parallel with fetching.")
+    parser.add_argument("--parser", default="html.parser", help="HTML parser backend.")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Maximum requests per second.")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries per failed request.")
+    parser.add_argument("--cache", action="store_true", help="Use a manga details cache shared by all runs.")
+    parser.add_argument("--runs", type=int, default=1, help="Exports of the same lists, later runs show the effect of --cache.")
+    parser.add_argument("--cli", action="store_true", help="Run the batch command in a separate process.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a report.")
+    args = parser.parse_args()
+
+    server = start_mock_server(MockServerConfig(
+        pages=args.pages,
+        entries=args.entries,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        shared=args.shared,
+    ))
+    os.environ["MANGAGO_BASE_URL"] = server.base_url
+    codes = [f"bench{i}" for i in range(1, args.lists + 1)]
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(args.runs):
+            if args.cli:
+                runs.append(run_cli(args, codes, Path(tmp), server.base_url))
+            else:
+                runs.append(run_in_process(args, codes, Path(tmp)))
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({"runs": runs, "server": str(server.stats)}, indent=4))
+    else:
+        print_report(runs, str(server.stats))
+    return 1 if any(result.get("exit_code") for result in runs) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
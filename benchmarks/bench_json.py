@@ -0,0 +1,94 @@
+"""
+JSON encoding benchmark for the exporter.
+
+Encodes a generated manga list with each installed JSON backend, pretty and
+compact, and with the original asdict and json.dumps path, and reports the
+median encode time and peak memory allocated while encoding.
+
+    python benchmarks/bench_json.py
+    python benchmarks/bench_json.py --entries 50000 --runs 3 --json
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_memory import make_records
+from src.config import JSON_BACKENDS
+from src.exporter import encode_json
+from src.models import Manga, MangaList, MangaListEntry
+
+def build_manga_list(records: List[dict]) -> MangaList:
+    manga_list = MangaList(title="Benchmark list", url="https://www.mangago.me/home/mangalist/0/", creator="benchmark", tags=["bench"])
+    for record in records:
+        manga = Manga(**{key: value for key, value in record.items() if key not in ("comment", "add_date")})
+        manga_list.entries.append(MangaListEntry(manga=manga, url=record["url"], comment=record["comment"], add_date=record["add_date"]))
+    return manga_list
+
+def get_encoders(manga_list: MangaList) -> Dict[str, Callable[[], bytes]]:
+    encoders = {
+        "asdict + json.dumps": lambda: json.dumps(asdict(manga_list), indent=4, ensure_ascii=False).encode("utf-8"),
+    }
+    for backend in JSON_BACKENDS:
+        if backend == "auto" or (backend != "json" and importlib.util.find_spec(backend) is None):
+            continue
+        encoders[f"{backend} pretty"] = lambda backend=backend: encode_json(manga_list, backend, pretty=True)
+        encoders[f"{backend} compact"] = lambda backend=backend: encode_json(manga_list, backend, pretty=False)
+    return encoders
+
+def measure_time(encode: Callable[[], bytes], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        encode()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def measure_peak_memory(encode: Callable[[], bytes]) -> Tuple[int, int]:
+    # Traced separately, tracemalloc slows down allocations
+    gc.collect()
+    tracemalloc.start()
+    encoded = encode()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, len(encoded)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON encode time and peak memory of the exporter backends.")
+    parser.add_argument("--entries", type=int, default=10000, help="Manga list entries to encode.")
+    parser.add_argument("--runs", type=int, default=5, help="Encodes per backend, the median is reported.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a report.")
+    args = parser.parse_args()
+
+    manga_list = build_manga_list(make_records(args.entries))
+    results = {}
+    for name, encode in get_encoders(manga_list).items():
+        peak, size = measure_peak_memory(encode)
+        results[name] = {
+            "encode_ms": measure_time(encode, args.runs) * 1000,
+            "peak_mib": peak / 1024 / 1024,
+            "output_mib": size / 1024 / 1024,
+        }
+
+    if args.json:
+        print(json.dumps({"entries": args.entries, "results": results}, indent=4))
+    else:
+        print(f"{args.entries} entries")
+        print(f"{'backend':<24}{'encode':>12}{'peak memory':>16}{'output':>12}")
+        for name, result in results.items():
+            print(f"{name:<24}{result['encode_ms']:>9.1f} ms{result['peak_mib']:>12.1f} MiB{result['output_mib']:>8.1f} MiB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
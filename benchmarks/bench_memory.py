@@ -0,0 +1,130 @@
+"""
+Memory benchmark for the manga list models.
+
+Builds the same manga list entries with the slotted, interned models in
+src/models.py and with plain dataclasses laid out like the original models,
+then reports the memory held per 10k entries by each.
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --entries 50000 --json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pages import GENRES, STATUSES, WORDS
+from src.models import Manga, MangaListEntry
+
+@dataclass
+class PlainManga:
+    title: Optional[str] = None
+    url: Optional[str] = None
+    cover_url: Optional[str] = None
+    author: Optional[str] = None
+    genres: List[str] = field(default_factory=list)
+    alternatives: List[str] = field(default_factory=list)
+    summary: Optional[str] = None
+    status: Optional[str] = None
+    released_year: Optional[int] = None
+    rating: Optional[float] = None
+    votes: Optional[int] = None
+
+@dataclass
+class PlainMangaListEntry:
+    manga: Optional[PlainManga] = None
+    url: Optional[str] = None
+    comment: Optional[str] = None
+    add_date: Optional[str] = None
+
+def fresh(text: str) -> str:
+    # Parsed strings are new objects even when their text repeats
+    return "".join(list(text))
+
+def make_records(count: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    authors = [" ".join(rng.choice(WORDS) for _ in range(2)).title() for _ in range(max(1, count // 20))]
+    records = []
+    for i in range(count):
+        records.append({
+            "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).title(),
+            "url": f"https://www.mangago.me/read-manga/manga_{i}/",
+            "cover_url": f"https://www.mangago.me/covers/manga_{i}.jpg",
+            "author": rng.choice(authors),
+            "genres": rng.sample(GENRES, rng.randint(1, 8)),
+            "alternatives": [" ".join(rng.choice(WORDS) for _ in range(3)).title() for _ in range(rng.randint(1, 4))],
+            "summary": " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))),
+            "status": rng.choice(STATUSES),
+            "released_year": rng.randint(1995, 2024),
+            "rating": round(rng.uniform(5, 10), 1),
+            "votes": rng.randint(1, 50000),
+            "comment": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 20))),
+            "add_date": f"20{rng.randint(12, 24)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    return records
+
+def build(records: List[dict], manga_class, entry_class) -> list:
+    entries = []
+    for record in records:
+        manga = manga_class(
+            title=fresh(record["title"]),
+            url=fresh(record["url"]),
+            cover_url=fresh(record["cover_url"]),
+            author=fresh(record["author"]),
+            genres=[fresh(genre) for genre in record["genres"]],
+            alternatives=[fresh(alternative) for alternative in record["alternatives"]],
+            summary=fresh(record["summary"]),
+            status=fresh(record["status"]),
+            released_year=record["released_year"],
+            rating=record["rating"],
+            votes=record["votes"],
+        )
+        entries.append(entry_class(manga=manga, url=fresh(record["url"]), comment=fresh(record["comment"]), add_date=fresh(record["add_date"])))
+    return entries
+
+def measure(build_entries: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    entries = build_entries()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare memory held by the compact and plain manga list models.")
+    parser.add_argument("--entries", type=int, default=10000, help="Manga list entries to build.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a report.")
+    args = parser.parse_args()
+
+    records = make_records(args.entries)
+    plain = measure(lambda: build(records, PlainManga, PlainMangaListEntry))
+    compact = measure(lambda: build(records, Manga, MangaListEntry))
+    scale = 10000 / args.entries
+    results = {
+        "entries": args.entries,
+        "plain_kib_per_10k": plain * scale / 1024,
+        "compact_kib_per_10k": compact * scale / 1024,
+        "reduction": 1 - compact / plain,
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print(f"{args.entries} entries")
+        print(f"{'plain dataclasses':<24}{results['plain_kib_per_10k']:>12.0f} KiB per 10k entries")
+        print(f"{'slotted and interned':<24}{results['compact_kib_per_10k']:>12.0f} KiB per 10k entries")
+        print(f"{'reduction':<24}{results['reduction']:>12.1%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
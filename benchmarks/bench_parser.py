@@ -0,0 +1,171 @@
+"""
+Offline parser benchmark over the saved pages in benchmarks/fixtures.
+
+Reports pages/sec, per-function latency percentiles and peak memory for each
+parser backend, and exits with status 1 when throughput drops more than the
+allowed tolerance below the baseline saved on this machine. The first run
+saves benchmarks/baseline.json, later runs are compared against it.
+
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --backend lxml --iterations 200
+    python benchmarks/bench_parser.py --tolerance 0.2
+    python benchmarks/bench_parser.py --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.parser import (
+    PARSER_BACKENDS,
+    check_parser_backend,
+    make_manga_list_entries_soup,
+    make_manga_soup,
+    make_soup,
+    parse_manga,
+    parse_manga_list_entries,
+    parse_manga_list_info,
+)
+from src.utils import get_date_from_manga_list_timestamp
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures"
+# Throughput depends on the machine, so each machine keeps its own baseline
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+TIMESTAMPS = ["14 03,2019", "3 days ago", "5 hours ago", "12 minutes ago", "40 seconds ago", "yesterday"]
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def time_call(samples: Dict[str, List[float]], name: str, func: Callable, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    samples.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+def load_fixtures() -> Dict[str, List[str]]:
+    fixtures = {"list": [], "manga": []}
+    # Generated pages at the top, real pages copied from an archive in captured/
+    for path in sorted(FIXTURES_PATH.rglob("*.html")):
+        kind = "list" if path.name.startswith("list") else "manga"
+        fixtures[kind].append(path.read_text(encoding="utf-8"))
+    return fixtures
+
+def run_pages(fixtures: Dict[str, List[str]], backend: str, samples: Dict[str, List[float]]) -> int:
+    pages = 0
+    for html in fixtures["list"]:
+        soup = time_call(samples, "make_soup (list info)", make_soup, html, backend)
+        time_call(samples, "parse_manga_list_info", parse_manga_list_info, soup)
+        soup = time_call(samples, "make_manga_list_entries_soup", make_manga_list_entries_soup, html, backend)
+        time_call(samples, "parse_manga_list_entries", parse_manga_list_entries, soup)
+        pages += 1
+    for html in fixtures["manga"]:
+        soup = time_call(samples, "make_manga_soup", make_manga_soup, html, backend)
+        time_call(samples, "parse_manga", parse_manga, soup)
+        pages += 1
+    for text in TIMESTAMPS:
+        time_call(samples, "get_date_from_manga_list_timestamp", get_date_from_manga_list_timestamp, text)
+    return pages
+
+def bench_backend(fixtures: Dict[str, List[str]], backend: str, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        run_pages(fixtures, backend, {})
+
+    samples = {}
+    pages = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pages += run_pages(fixtures, backend, samples)
+    elapsed = time.perf_counter() - start
+
+    # Peak memory of a single pass, measured separately so tracing does not skew timings
+    tracemalloc.start()
+    run_pages(fixtures, backend, {})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pages_per_sec": pages / elapsed,
+        "peak_memory_kib": peak / 1024,
+        "functions": {
+            name: {
+                "calls": len(values),
+                "mean_ms": statistics.fmean(values) * 1000,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+            for name, values in samples.items()
+        },
+    }
+
+def print_report(results: Dict[str, dict]):
+    for backend, result in results.items():
+        print(f"\n== {backend}: {result['pages_per_sec']:.1f} pages/sec, peak memory {result['peak_memory_kib']:.0f} KiB")
+        print(f"{'function':<38}{'calls':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, stats in result["functions"].items():
+            print(f"{name:<38}{stats['calls']:>8}{stats['mean_ms']:>10.3f}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+def check_regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    failures = []
+    for backend, result in results.items():
+        if backend not in baseline:
+            continue
+        expected = baseline[backend]["pages_per_sec"]
+        minimum = expected * (1 - tolerance)
+        if result["pages_per_sec"] < minimum:
+            failures.append(f"{backend}: {result['pages_per_sec']:.1f} pages/sec is below {minimum:.1f} (baseline {expected:.1f}, tolerance {tolerance:.0%})")
+    return failures
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the HTML parsers on saved Mangago pages.")
+    parser.add_argument("--backend", action="append", choices=PARSER_BACKENDS, help="Parser backend to benchmark, repeatable. Defaults to every installed backend.")
+    parser.add_argument("--iterations", type=int, default=50, help="Passes over the fixture corpus per backend.")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed passes before measuring.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="JSON file with baseline pages/sec per backend to compare against. Saved from this run when it does not exist yet.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed throughput drop below the baseline, as a fraction.")
+    parser.add_argument("--save-baseline", type=Path, help="Write the measured pages/sec to this JSON file, e.g. after an intended slowdown.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a table.")
+    args = parser.parse_args()
+
+    backends = []
+    for backend in args.backend or PARSER_BACKENDS:
+        try:
+            check_parser_backend(backend)
+            backends.append(backend)
+        except ValueError as e:
+            print(f"Skipping {backend}: {e}", file=sys.stderr)
+
+    fixtures = load_fixtures()
+    results = {backend: bench_backend(fixtures, backend, args.iterations, args.warmup) for backend in backends}
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        print_report(results)
+
+    failures = []
+    if args.baseline.exists():
+        failures.extend(check_regressions(results, json.loads(args.baseline.read_text()), args.tolerance))
+    elif not args.save_baseline:
+        args.save_baseline = args.baseline
+        print(f"No baseline yet, later runs are compared against {args.baseline}", file=sys.stderr)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps({backend: {"pages_per_sec": result["pages_per_sec"]} for backend, result in results.items()}, indent=4) + "\n")
+
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Cold start benchmark for the CLI.
+
+Starts fresh interpreters that import cli.main, show the CLI help and print
+the launcher version, and reports the median wall time of each over the bare
+interpreter start. Fails when a command takes longer than the budget, or when
+importing cli.main loads modules only the export commands need.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --budget-ms 100 --help-budget-ms 300
+    python benchmarks/bench_startup.py --importtime
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "python": ["-c", "pass"],
+    "import cli.main": ["-c", "import cli.main"],
+    "cli.main --help": ["-m", "cli.main", "--help"],
+    "launcher.py --version": ["launcher.py", "--version"],
+}
+
+# Loaded by the export commands, never by option parsing or --help
+DEFERRED_MODULES = ("selenium", "bs4", "lxml", "requests", "sqlite3", "rich.table", "rich.progress", "cli.commands", "src.parser", "src.fetcher")
+
+def time_command(arguments: List[str], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], cwd=ROOT_PATH, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def find_loaded_modules(modules: Tuple[str, ...]) -> List[str]:
+    code = f"import sys, cli.main; print(' '.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT_PATH, capture_output=True, text=True, check=True).stdout
+    return output.split()
+
+def get_import_times(limit: int) -> List[Tuple[str, float]]:
+    # -X importtime reports cumulative microseconds per module on stderr
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import cli.main"], cwd=ROOT_PATH, capture_output=True, text=True, check=True).stderr
+    import_times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        import_times.append((module.strip(), int(cumulative) / 1000))
+    return sorted(import_times, key=lambda import_time: import_time[1], reverse=True)[:limit]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure CLI cold start and fail when it goes over budget.")
+    parser.add_argument("--runs", type=int, default=10, help="Interpreters started per command, the median is reported.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum milliseconds importing cli.main or printing the version may add to the bare interpreter start.")
+    parser.add_argument("--help-budget-ms", type=float, default=400.0, help="Same for --help, which also loads the rich help formatter of typer.")
+    parser.add_argument("--importtime", action="store_true", help="Also print the slowest imports of cli.main.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON instead of a report.")
+    args = parser.parse_args()
+
+    timings: Dict[str, float] = {name: time_command(arguments, args.runs) * 1000 for name, arguments in COMMANDS.items()}
+    baseline = timings.pop("python")
+    overheads = {name: timing - baseline for name, timing in timings.items()}
+    budgets = {name: args.help_budget_ms if name.endswith("--help") else args.budget_ms for name in overheads}
+    over_budget = [name for name, overhead in overheads.items() if overhead > budgets[name]]
+    loaded_modules = find_loaded_modules(DEFERRED_MODULES)
+
+    if args.json:
+        print(json.dumps({
+            "python_ms": baseline,
+            "commands_ms": timings,
+            "overhead_ms": overheads,
+            "budget_ms": budgets,
+            "over_budget": over_budget,
+            "loaded_deferred_modules": loaded_modules,
+        }, indent=4))
+    else:
+        print(f"{'python':<24}{baseline:>9.1f} ms")
+        for name, timing in timings.items():
+            print(f"{name:<24}{timing:>9.1f} ms  +{overheads[name]:.1f} ms (budget {budgets[name]:.0f} ms)")
+        if args.importtime:
+            print("\nslowest imports of cli.main")
+            for module, cumulative in get_import_times(15):
+                print(f"{module:<40}{cumulative:>9.1f} ms")
+
+    failed = False
+    for name in over_budget:
+        print(f"REGRESSION {name}: +{overheads[name]:.1f} ms over the interpreter start, budget {budgets[name]:.0f} ms", file=sys.stderr)
+        failed = True
+    if loaded_modules:
+        print(f"REGRESSION import cli.main loads {', '.join(loaded_modules)}", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Copy real Mangago pages from an --archive archive into benchmarks/fixtures/captured.
+
+The generated fixtures only follow the markup src/parser.py expects, captured
+pages keep the parser benchmark and check_parser.py honest about the real site.
+
+    python -m cli.main --archive
+    python benchmarks/capture_fixtures.py --lists 2 --manga 4
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.archive import HtmlArchive
+
+CAPTURED_PATH = Path(__file__).parent / "fixtures" / "captured"
+ARCHIVE_PATH = Path(__file__).parent.parent / "saves" / "archive"
+LIST_URL = re.compile(r"/home/mangalist/(?P<code>[^/]+)/\?filter=&page=(?P<page>\d+)$")
+MANGA_URL = re.compile(r"/read-manga/(?P<slug>[^/]+)/?$")
+
+def get_fixture_name(url: str):
+    # Names start with the page kind, the parser benchmark and check tell them apart by it
+    if (match := LIST_URL.search(url)) is not None:
+        return f"list_{match.group('code')}_{match.group('page')}.html"
+    if (match := MANGA_URL.search(url)) is not None:
+        return f"manga_{match.group('slug')}.html"
+    return None
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Copy archived Mangago pages into the parser fixture corpus.")
+    parser.add_argument("--archive", type=Path, default=ARCHIVE_PATH, help="Archive folder written by --archive.")
+    parser.add_argument("--lists", type=int, default=2, help="List pages to copy.")
+    parser.add_argument("--manga", type=int, default=4, help="Manga pages to copy.")
+    args = parser.parse_args()
+
+    if not (args.archive / "index.sqlite3").exists():
+        print(f"No archive in {args.archive}, export a list with --archive first", file=sys.stderr)
+        return 1
+
+    limits = {"list": args.lists, "manga": args.manga}
+    copied = {"list": 0, "manga": 0}
+    CAPTURED_PATH.mkdir(parents=True, exist_ok=True)
+    with HtmlArchive(args.archive) as archive:
+        for url in archive.urls():
+            name = get_fixture_name(url)
+            if name is None:
+                continue
+            kind = name.split("_", 1)[0]
+            if copied[kind] >= limits[kind]:
+                continue
+            html = archive.get(url)
+            if html is None:
+                continue
+            (CAPTURED_PATH / name).write_text(html, encoding="utf-8")
+            copied[kind] += 1
+            print(f"{name}: {len(html) / 1024:.1f} KiB from {url}")
+
+    if not any(copied.values()):
+        print("No list or manga pages in the archive", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
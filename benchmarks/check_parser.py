@@ -0,0 +1,74 @@
+"""
+Parser output check over the saved pages in benchmarks/fixtures.
+
+Parses every fixture, generated ones and real pages in fixtures/captured,
+with each installed parser backend, with and without the strainers, and exits
+with status 1 when any of them gives a different manga list, manga list
+entries or manga than html.parser on the whole page.
+
+    python benchmarks/check_parser.py
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.parser import (
+    PARSER_BACKENDS,
+    make_manga_list_entries_soup,
+    make_manga_soup,
+    make_soup,
+    parse_manga,
+    parse_manga_list_entries,
+    parse_manga_list_info,
+)
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures"
+REFERENCE = ("html.parser", "unstrained")
+
+def get_parsers(path: Path, backends: List[str]) -> Dict[tuple, Callable[[str], object]]:
+    parsers = {}
+    for backend in backends:
+        if path.name.startswith("list"):
+            parsers[(backend, "unstrained")] = lambda html, backend=backend: parse_manga_list_entries(make_soup(html, backend))
+            parsers[(backend, "strained")] = lambda html, backend=backend: parse_manga_list_entries(make_manga_list_entries_soup(html, backend))
+            # The list info is always read from the whole page, only compared between backends
+            parsers[(backend, "list info")] = lambda html, backend=backend: parse_manga_list_info(make_soup(html, backend))
+        else:
+            parsers[(backend, "unstrained")] = lambda html, backend=backend: parse_manga(make_soup(html, backend))
+            parsers[(backend, "strained")] = lambda html, backend=backend: parse_manga(make_manga_soup(html, backend))
+    return parsers
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that every parser backend, strained or not, parses the fixtures the same.")
+    parser.parse_args()
+
+    backends = [backend for backend in PARSER_BACKENDS if backend == "html.parser" or importlib.util.find_spec(backend) is not None]
+    paths = sorted(FIXTURES_PATH.rglob("*.html"))
+    if not paths:
+        print(f"No fixtures in {FIXTURES_PATH}, run benchmarks/make_fixtures.py first", file=sys.stderr)
+        return 1
+
+    failed = False
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+        results = {key: parse(html) for key, parse in get_parsers(path, backends).items()}
+        mismatches = []
+        for (backend, variant), result in results.items():
+            reference = results[("html.parser", "list info")] if variant == "list info" else results[REFERENCE]
+            if result != reference:
+                mismatches.append(f"{backend} {variant}")
+        name = path.relative_to(FIXTURES_PATH).as_posix()
+        print(f"{name:<40}{'ok' if not mismatches else 'MISMATCH':>10}  {', '.join(backends)}")
+        for mismatch in mismatches:
+            print(f"MISMATCH {name}: {mismatch} differs from html.parser on the whole page", file=sys.stderr)
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
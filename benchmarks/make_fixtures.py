@@ -0,0 +1,31 @@
+"""
+Regenerate the fixture corpus in benchmarks/fixtures.
+
+    python benchmarks/make_fixtures.py
+"""
+
+from pathlib import Path
+
+from pages import render_manga_list_page, render_manga_page
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures"
+
+# name: (renderer, keyword arguments)
+FIXTURES = {
+    "list_small.html": (render_manga_list_page, dict(code="1001", pages=1, entries=5, noise_blocks=2)),
+    "list_medium.html": (render_manga_list_page, dict(code="1002", pages=12, entries=30)),
+    "list_large.html": (render_manga_list_page, dict(code="1003", pages=45, entries=60, noise_blocks=8)),
+    "manga_small.html": (render_manga_page, dict(slug="small", genres=2, summary_words=30, noise_blocks=2)),
+    "manga_medium.html": (render_manga_page, dict(slug="medium", genres=5, summary_words=150)),
+    "manga_large.html": (render_manga_page, dict(slug="large", genres=12, summary_words=800, noise_blocks=8)),
+}
+
+def main():
+    FIXTURES_PATH.mkdir(exist_ok=True)
+    for name, (render, kwargs) in FIXTURES.items():
+        html = render(**kwargs)
+        (FIXTURES_PATH / name).write_text(html, encoding="utf-8")
+        print(f"{name}: {len(html) / 1024:.1f} KiB")
+
+if __name__ == "__main__":
+    main()
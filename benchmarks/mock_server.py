@@ -0,0 +1,180 @@
+"""
+Local stand-in for Mangago serving generated list and manga pages.
+
+Every list code exists and has the configured number of pages and entries per
+page. Responses can be delayed and a share of them can fail with HTTP 503, to
+exercise concurrency, retries and caching without touching the network.
+
+    python benchmarks/mock_server.py --pages 20 --entries 30 --latency 0.05 --error-rate 0.02
+    MANGAGO_BASE_URL=http://127.0.0.1:8765 python -m cli.main --backend http
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from pages import render_manga_list_page, render_manga_page
+
+LIST_PATH = re.compile(r"^/home/mangalist/(?P<code>[^/]+)/\?filter=&page=(?P<page>\d+)$")
+MANGA_PATH = re.compile(r"^/read-manga/(?P<slug>[^/]+)/$")
+COVER_PATH = re.compile(r"^/covers/(?P<slug>[^/]+)\.jpg$")
+
+@dataclass
+class MockServerConfig:
+    pages: int = 5
+    entries: int = 30
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    # Share of entries pointing to manga that appear on every list
+    shared: float = 0.0
+    seed: int = 0
+
+@dataclass
+class MockServerStats:
+    list_pages: int = 0
+    manga_pages: int = 0
+    covers: int = 0
+    errors: int = 0
+    not_found: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def __str__(self):
+        return f"{self.list_pages} list pages, {self.manga_pages} manga pages, {self.covers} covers, {self.errors} errors, {self.not_found} not found"
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockServerConfig):
+        super().__init__(address, MockRequestHandler)
+        self.config = config
+        self.stats = MockServerStats()
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def entry_urls(self, code: str, page: int):
+        shared = round(self.config.entries * self.config.shared)
+        return [
+            f"{self.base_url}/read-manga/shared_{(page - 1) * shared + i}/" if i < shared else f"{self.base_url}/read-manga/{code}_{page}_{i}/"
+            for i in range(self.config.entries)
+        ]
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    server: MockServer
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        config = self.server.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + config.jitter * self.server.random())
+
+        if config.error_rate and self.server.random() < config.error_rate:
+            self.server.stats.count("errors")
+            self.send_body(503, "Service Unavailable")
+            return
+
+        list_match = LIST_PATH.match(self.path)
+        if list_match:
+            code, page = list_match.group("code"), int(list_match.group("page"))
+            self.server.stats.count("list_pages")
+            entries = config.entries if 1 <= page <= config.pages else 0
+            html = render_manga_list_page(
+                code,
+                page,
+                config.pages,
+                entries,
+                base_url=self.server.base_url,
+                seed=config.seed,
+                entry_urls=self.server.entry_urls(code, page)[:entries],
+            )
+            self.send_body(200, html)
+            return
+
+        manga_match = MANGA_PATH.match(self.path)
+        if manga_match:
+            self.server.stats.count("manga_pages")
+            self.send_body(200, render_manga_page(manga_match.group("slug"), seed=config.seed, base_url=self.server.base_url))
+            return
+
+        cover_match = COVER_PATH.match(self.path)
+        if cover_match:
+            self.server.stats.count("covers")
+            # Stand-in image bytes, a few KiB and stable per manga
+            seed = hashlib.sha256(cover_match.group("slug").encode("utf-8")).digest()
+            self.send_bytes(200, b"\xff\xd8\xff\xe0" + seed * 128, "image/jpeg")
+            return
+
+        self.server.stats.count("not_found")
+        self.send_body(404, "Not Found")
+
+    def send_body(self, status: int, text: str):
+        self.send_bytes(status, text.encode("utf-8"), "text/html; charset=utf-8")
+
+    def send_bytes(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_mock_server(config: Optional[MockServerConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    # Port 0 picks a free port, read it back from server.base_url
+    server = MockServer((host, port), config or MockServerConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve generated Mangago list and manga pages locally.")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--pages", type=int, default=5, help="List pages per manga list.")
+    arg_parser.add_argument("--entries", type=int, default=30, help="Entries per list page.")
+    arg_parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    arg_parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random seconds per response.")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0, help="Share of responses failing with HTTP 503.")
+    arg_parser.add_argument("--shared", type=float, default=0.0, help="Share of entries pointing to manga present on every list.")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    config = MockServerConfig(
+        pages=args.pages,
+        entries=args.entries,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        shared=args.shared,
+        seed=args.seed,
+    )
+    server = MockServer((args.host, args.port), config)
+    print(f"Serving on {server.base_url}, set MANGAGO_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Generators for Mangago-like list and manga pages.
+
+The markup follows what src/parser.py reads, surrounded by the kind of
+navigation, script and ad noise a saved page carries, so parser timings are
+representative without touching the network.
+"""
+
+import random
+from html import escape
+from typing import List, Optional
+
+GENRES = [
+    "Action", "Adventure", "Comedy", "Drama", "Fantasy", "Historical", "Horror", "Josei",
+    "Mystery", "Psychological", "Romance", "School Life", "Seinen", "Shoujo", "Shounen",
+    "Slice Of Life", "Smut", "Supernatural", "Tragedy", "Yaoi",
+]
+STATUSES = ["Ongoing", "Completed"]
+WORDS = (
+    "the a an of to in and for with on at by from young old new last first hero villain "
+    "prince princess king queen knight mage dragon city school tower night day love war "
+    "secret promise shadow light dream blood moon sun star garden sea sky"
+).split()
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def _title(rng: random.Random) -> str:
+    return _words(rng, rng.randint(2, 6)).title()
+
+def _noise(rng: random.Random, blocks: int) -> str:
+    parts = []
+    for i in range(blocks):
+        links = "".join(f'<li><a href="/genre/{g.lower()}/">{g}</a></li>' for g in rng.sample(GENRES, 8))
+        parts.append(
+            f'<div class="nav_block" id="nav{i}"><ul class="menu">{links}</ul>'
+            f'<script type="text/javascript">var slot{i} = {{"id": {rng.randint(1, 99999)}, "size": [728, 90]}};</script>'
+            f'<div class="ad_slot"><iframe src="https://ads.example.com/slot/{i}" width="728" height="90"></iframe></div></div>'
+        )
+    return "".join(parts)
+
+def _page(body: str, title: str, noise: str) -> str:
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{escape(title)} - Mangago</title>"
+        '<meta charset="utf-8"><link rel="stylesheet" href="/css/style.css">'
+        '<script src="/js/jquery.min.js"></script>'
+        "</head><body>"
+        f'<div id="header">{noise}</div>'
+        f'<div id="page">{body}</div>'
+        f'<div id="footer">{noise}</div>'
+        "</body></html>"
+    )
+
+def _timestamp(rng: random.Random) -> str:
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"{rng.randint(1, 28):02d} {rng.randint(1, 12):02d},{rng.randint(2012, 2024)}"
+    unit = ["days", "hours", "minutes", "seconds"][kind - 1]
+    return f"{rng.randint(2, 59)} {unit} ago"
+
+def render_manga_list_page(
+    code: str = "1234567",
+    page: int = 1,
+    pages: int = 1,
+    entries: int = 30,
+    base_url: str = "https://www.mangago.me",
+    seed: int = 0,
+    noise_blocks: int = 4,
+    entry_urls: Optional[List[str]] = None,
+) -> str:
+    rng = random.Random(f"{seed}-{code}-{page}")
+    list_title = _title(random.Random(f"{seed}-{code}"))
+
+    items = []
+    for i in range(entries):
+        url = entry_urls[i] if entry_urls else f"{base_url}/read-manga/{code}_{page}_{i}/"
+        comment = _words(rng, rng.randint(0, 40))
+        items.append(
+            '<div class="manga note-and-order">'
+            f'<div class="left"><a href="{url}"><img src="{base_url}/covers/{code}_{page}_{i}.jpg"></a></div>'
+            f'<div class="comment"><h3><a href="{url}">{escape(_title(rng))}</a></h3>'
+            + (f"<blockquote>{escape(comment)}</blockquote>" if comment else "")
+            + "</div>"
+            '<div class="mangalist_item_ft clear">'
+            f'<div class="left" style="color:#BDBDBD">{_timestamp(rng)}</div>'
+            '<div class="right"><a href="#">Edit</a></div></div></div>'
+        )
+
+    tags = "".join(f'<a class="tag" href="/tag/{g.lower()}/">{g}</a>' for g in rng.sample(GENRES, rng.randint(0, 5)))
+    body = (
+        f'<div class="w-title"><h1>{escape(list_title)}</h1></div>'
+        '<div class="user-profile"><img src="/avatar.png">'
+        f'<h2>user{code}</h2><p>Create: 2019-03-14</p><p>Last update: 2024-0{1 + seed % 9}-1{seed % 10}</p></div>'
+        f'<div class="description">{escape(_words(rng, 30))}&nbsp;{escape(_words(rng, 10))}</div>'
+        f'<div class="content">{tags}</div>'
+        f'<div class="list_wrap">{"".join(items)}</div>'
+        f'<div class="pagination" total="{pages}"><a href="?page={page}">{page}</a></div>'
+    )
+    return _page(body, list_title, _noise(rng, noise_blocks))
+
+def render_manga_page(
+    slug: str = "manga",
+    seed: int = 0,
+    genres: Optional[int] = None,
+    summary_words: Optional[int] = None,
+    base_url: str = "https://www.mangago.me",
+    noise_blocks: int = 4,
+) -> str:
+    rng = random.Random(f"{seed}-{slug}")
+    title = _title(rng)
+    genre_links = "".join(
+        f'<a href="/genre/{g.lower()}/">{g}</a>' + ("/" if i else "")
+        for i, g in enumerate(rng.sample(GENRES, genres if genres is not None else rng.randint(1, 8)))
+    )
+    alternatives = "; ".join(_title(rng) for _ in range(rng.randint(1, 4)))
+    summary = escape(_words(rng, summary_words if summary_words is not None else rng.randint(40, 200)))
+
+    body = (
+        f'<div class="w-title"><h1>{escape(title)}</h1></div>'
+        '<div id="information">'
+        f'<div class="left cover"><img src="{base_url}/covers/{slug}.jpg" alt="{escape(title)}"></div>'
+        '<div class="manga_right"><table class="left"><tbody>'
+        f'<tr><td><label>Status:</label><span>{rng.choice(STATUSES)}</span></td></tr>'
+        f'<tr><td><label>Author:</label><a href="/author/{slug}/">{escape(_title(rng))}</a> {rng.randint(1995, 2024)} released.</td></tr>'
+        f'<tr><td><label>Genre(s):</label>{genre_links}</td></tr>'
+        f'<tr><td><label>Alternative:</label>{escape(alternatives)}</td></tr>'
+        "</tbody></table>"
+        f'<div class="rating"><span class="rating_num">{rng.uniform(5, 10):.2f}</span><a href="#votes">({rng.randint(1, 50000)} votes)</a></div>'
+        "</div>"
+        f'<div class="manga_summary">{summary}<div class="expand">Expand</div></div>'
+        "</div>"
+    )
+    return _page(body, title, _noise(rng, noise_blocks))
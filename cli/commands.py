@@ -0,0 +1,608 @@
+"""
+Export commands behind the CLI in cli/main.py. Importing this module loads the
+parser, fetchers and exporters, so cli/main.py only does it once a command runs.
+"""
+
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import Executor
+from typing import Dict, List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from rich.prompt import Prompt, Confirm
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
+
+CURRENT_DIR = Path.cwd()
+SAVE_PATH = CURRENT_DIR / "saves"
+SAVE_PATH_JSON = SAVE_PATH / "json"
+SAVE_PATH_CSV = SAVE_PATH / "csv"
+SAVE_PATH_CACHE = SAVE_PATH / "cache" / "manga.sqlite3"
+SAVE_PATH_JOURNAL = SAVE_PATH / "journal"
+SAVE_PATH_ARCHIVE = SAVE_PATH / "archive"
+SAVE_PATH_SQLITE = SAVE_PATH / "sqlite" / "mangago.sqlite3"
+SAVE_PATH_COVERS = SAVE_PATH / "covers"
+SAVE_PATH_WATCH = SAVE_PATH / "watch" / "state.json"
+
+from src.models import Manga, MangaList
+from src.config import DEFAULT_COVER_WORKERS, DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, DEFAULT_JSON_BACKEND, DEFAULT_MAX_RETRIES, DEFAULT_PARSER_BACKEND, DEFAULT_RATE, DEFAULT_WORKERS, EXPORT_FORMATS
+from src.parser import get_manga_list_url, make_soup, parse_manga_list_info, parse_manga_list_entries
+from src.exporter import export_manga_list_to_json, export_manga_list_to_csv, export_manga_list_to_sqlite, export_manga_list_diff_to_json, CsvEntryWriter, JsonLinesEntryWriter, get_stream_filename
+from src.fetcher import ChromeProfile, Fetcher, create_fetcher, get_page_load_timers
+from src.pipeline import create_parse_executor, export_manga_list_pipelined
+from src.scheduler import RequestScheduler, ScheduledFetcher
+from src.archive import ArchivingFetcher, HtmlArchive, ReplayFetcher, get_archive
+from src.metrics import METRICS
+from src.covers import CoverStore, download_covers
+from src.cache import MangaCache
+from src.incremental import diff_manga_lists, find_previous_export, get_known_manga, is_manga_list_unchanged
+from src.journal import ExportJournal, JournalState
+from src.utils import needs_manga_details, sanitize_filename
+from src.batch import BatchSummary, read_codes_file
+from src.watch import BudgetedFetcher, ListWatcher, RequestBudget, WatchedList, is_manga_list_exported
+
+console = Console()
+
+@dataclass
+class AppSettings:
+    workers: int = DEFAULT_WORKERS
+    page_workers: Optional[int] = None
+    backend: str = "auto"
+    chrome_profile: ChromeProfile = field(default_factory=ChromeProfile)
+    rate: float = DEFAULT_RATE
+    max_retries: int = DEFAULT_MAX_RETRIES
+    parser: str = DEFAULT_PARSER_BACKEND
+    parse_workers: int = 0
+    use_cache: bool = True
+    cache_ttl: float = DEFAULT_CACHE_TTL
+    cache_size: int = DEFAULT_CACHE_SIZE
+    incremental: bool = False
+    resume: bool = False
+    stream: bool = False
+    compress: bool = False
+    archive: bool = False
+    replay: bool = False
+    metrics_path: Optional[Path] = None
+    fields: Optional[List[str]] = None
+    json_backend: str = DEFAULT_JSON_BACKEND
+    pretty: bool = True
+    covers: bool = False
+    cover_workers: int = DEFAULT_COVER_WORKERS
+
+@dataclass
+class ExportResult:
+    manga_list: MangaList
+    # Counted separately, streamed exports do not keep their entries in the manga list
+    entries: int = 0
+    failed_pages: int = 0
+    failed_entries: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed_pages and not self.failed_entries
+
+def app_create_fetcher(settings: AppSettings, budget: Optional[RequestBudget] = None) -> Fetcher:
+    # Replay archived pages without touching the network
+    if settings.replay:
+        return ReplayFetcher(HtmlArchive(SAVE_PATH_ARCHIVE))
+
+    # Set page fetcher shared by list pages and manga details, one connection or driver per page or detail worker at most
+    fetcher = create_fetcher(settings.backend, size=settings.workers + (settings.page_workers or settings.workers), profile=settings.chrome_profile)
+    # Count every request that reaches the network, retries included
+    if budget is not None:
+        fetcher = BudgetedFetcher(fetcher, budget)
+    if settings.archive:
+        fetcher = ArchivingFetcher(fetcher, HtmlArchive(SAVE_PATH_ARCHIVE))
+    return ScheduledFetcher(fetcher, RequestScheduler(rate=settings.rate), max_retries=settings.max_retries)
+
+def app_close_fetcher(fetcher: Fetcher):
+    fetcher.close()
+    archive = get_archive(fetcher)
+    if archive is not None:
+        archive.close()
+
+def app_write_metrics(console: Console, settings: AppSettings):
+    # Write stage counts and latencies collected so far
+    if settings.metrics_path is None:
+        return
+    try:
+        METRICS.write(settings.metrics_path)
+    except OSError as e:
+        console.print(f"\n[red]Error writing metrics to '{settings.metrics_path}': {e}[/red]")
+
+def app_open_cache(settings: AppSettings) -> Optional[MangaCache]:
+    # Set manga details cache, replays always parse the archived pages again
+    if not settings.use_cache or settings.replay:
+        return None
+    return MangaCache(SAVE_PATH_CACHE, ttl=settings.cache_ttl, max_entries=settings.cache_size)
+
+def app_open_parse_executor(settings: AppSettings) -> Optional[Executor]:
+    # Set parser processes once per session, starting them costs an interpreter and a bs4 import each
+    if settings.parse_workers <= 0:
+        return None
+    return create_parse_executor(settings.parse_workers)
+
+def app_get_initial_manga_list(console: Console, fetcher: Fetcher, code: str, parser: str = DEFAULT_PARSER_BACKEND):
+    try:
+        # Load first page of manga list and get manga list with info and first entries
+        manga_list_url = get_manga_list_url(code, 1)
+        manga_list_first_page_soup = make_soup(fetcher.fetch(manga_list_url), parser)
+        manga_list = parse_manga_list_info(manga_list_first_page_soup)
+        manga_list.url = manga_list_url
+        manga_list.entries = parse_manga_list_entries(manga_list_first_page_soup)
+
+        return manga_list
+    
+    except Exception as e:
+        console.print(f"\n[red]Error fetching manga list: {e}[/red]")
+
+def app_export_manga_list(
+    console: Console,
+    fetcher: Fetcher,
+    manga_list: MangaList,
+    code: str,
+    settings: AppSettings,
+    cache: Optional[MangaCache] = None,
+    parse_executor: Optional[Executor] = None,
+    known_manga: Optional[Dict[str, Manga]] = None,
+    journal: Optional[ExportJournal] = None,
+    journal_state: Optional[JournalState] = None,
+    writers: Optional[List] = None,
+    keep_entries: bool = True,
+) -> Optional[ExportResult]:
+    failed_pages = []
+    failed_entries = []
+    known_manga = dict(known_manga or {})
+    if journal_state is not None:
+        known_manga.update(journal_state.manga)
+
+    try:
+        # Record progress so an interrupted export can be resumed
+        if journal is not None:
+            journal.open(manga_list, journal_state)
+
+        # Fetch remaining list pages and manga details at the same time
+        with Progress(SpinnerColumn(), TextColumn("Fetching manga list entries and details..."), BarColumn(), MofNCompleteColumn(), console=console) as progress:
+            task = progress.add_task("Fetching details...", total=0)
+            found_entries = 0
+
+            def on_page(page, manga_list_entries):
+                nonlocal found_entries
+                found_entries += len(manga_list_entries)
+                progress.update(task, total=found_entries)
+                if journal is not None:
+                    journal.record_page(page, manga_list_entries)
+
+            def on_entry(manga_list_entry):
+                progress.update(task, advance=1)
+                if journal is not None:
+                    journal.record_entry(manga_list_entry)
+                for writer in writers or []:
+                    writer.write(manga_list_entry)
+
+            def on_page_error(page, e):
+                failed_pages.append(page)
+                console.print(f"\n[red]Error fetching manga list entries for page {page}: {e}[/red]")
+
+            def on_entry_error(manga_list_entry, e):
+                failed_entries.append(manga_list_entry)
+                progress.update(task, advance=1)
+
+            export_manga_list_pipelined(
+                fetcher,
+                manga_list,
+                code,
+                workers=settings.workers,
+                page_workers=settings.page_workers,
+                cache=cache,
+                parser=settings.parser,
+                parse_executor=parse_executor,
+                known_manga=known_manga,
+                known_pages=journal_state.pages if journal_state is not None else None,
+                fetch_details=needs_manga_details(settings.fields),
+                keep_entries=keep_entries,
+                on_page=on_page,
+                on_entry=on_entry,
+                on_page_error=on_page_error,
+                on_entry_error=on_entry_error,
+            )
+
+        if failed_pages:
+            console.print(f"\n[yellow]Could not fetch {len(failed_pages)} of {manga_list.pages} list pages.[/yellow]")
+        if failed_entries:
+            console.print(f"\n[yellow]Could not fetch details for {len(failed_entries)} of {found_entries} entries.[/yellow]")
+        if cache is not None:
+            console.print(f"\n[dim]Cache: {cache.stats}[/dim]")
+        for name, timer in get_page_load_timers(fetcher):
+            console.print(f"[dim]{name} page loads: {timer}[/dim]")
+        if isinstance(fetcher, ScheduledFetcher):
+            console.print(f"[dim]Requests: {fetcher.scheduler.stats}, current rate {fetcher.scheduler.rate:.1f}/s[/dim]")
+        archive = get_archive(fetcher)
+        if archive is not None:
+            console.print(f"[dim]Archive: {archive.stats}[/dim]")
+
+        # Keep journal around while something is still missing
+        if journal is not None:
+            if failed_pages or failed_entries:
+                journal.close()
+                console.print("\n[yellow]Run again with --resume to retry the missing pages and entries.[/yellow]")
+            else:
+                journal.discard()
+
+        return ExportResult(manga_list, entries=found_entries, failed_pages=len(failed_pages), failed_entries=len(failed_entries))
+    
+    except Exception as e:
+        console.print(f"\n[red]Error fetching manga details: {e}[/red]")
+        if journal is not None:
+            journal.close()
+            console.print("\n[yellow]Progress saved. Run again with --resume to continue this export.[/yellow]")
+
+def app_load_manga_list(console: Console, fetcher: Fetcher, code: str, settings: AppSettings):
+    # Load saved progress of an interrupted export
+    journal = ExportJournal(SAVE_PATH_JOURNAL / f"{sanitize_filename(code)}.jsonl")
+    journal_state = journal.load() if settings.resume else None
+
+    if journal_state is not None:
+        manga_list = journal_state.manga_list
+        console.print(f"\n[blue]Resuming export: {journal_state}.[/blue]")
+    else:
+        with console.status(f"[bold green]Searching for manga list with code '{code}'...[/bold green]"):
+            manga_list = app_get_initial_manga_list(console, fetcher, code, settings.parser)
+
+    return manga_list, journal, journal_state
+
+def app_download_covers(console: Console, manga_list: MangaList, settings: AppSettings):
+    with CoverStore(SAVE_PATH_COVERS) as store:
+        with Progress(SpinnerColumn(), TextColumn("Downloading covers..."), BarColumn(), MofNCompleteColumn(), console=console) as progress:
+            cover_urls = {manga_list_entry.manga.cover_url for manga_list_entry in manga_list.entries if manga_list_entry.manga and manga_list_entry.manga.cover_url}
+            task = progress.add_task("Downloading covers...", total=len(cover_urls))
+            download_covers(manga_list, store, workers=settings.cover_workers, on_cover=lambda url, e: progress.update(task, advance=1))
+        console.print(f"\n[dim]Covers: {store.stats}[/dim]")
+
+def app_save_manga_list(
+    console: Console,
+    fetcher: Fetcher,
+    manga_list: MangaList,
+    code: str,
+    settings: AppSettings,
+    formats: List[str],
+    cache: Optional[MangaCache] = None,
+    parse_executor: Optional[Executor] = None,
+    previous_manga_list: Optional[MangaList] = None,
+    shared_manga: Optional[Dict[str, Manga]] = None,
+    journal: Optional[ExportJournal] = None,
+    journal_state: Optional[JournalState] = None,
+) -> Optional[ExportResult]:
+    # Open streaming writers so entries are saved while they are fetched
+    writers = []
+    if settings.stream and "json" in formats:
+        writers.append(JsonLinesEntryWriter(get_stream_filename(manga_list.title, SAVE_PATH_JSON, "jsonl.gz" if settings.compress else "jsonl"), compress=settings.compress, fields=settings.fields, backend=settings.json_backend))
+    if settings.stream and "csv" in formats:
+        writers.append(CsvEntryWriter(get_stream_filename(manga_list.title, SAVE_PATH_CSV, "csv"), fields=settings.fields))
+
+    known_manga = get_known_manga(previous_manga_list, settings.fields)
+    if shared_manga:
+        known_manga.update(shared_manga)
+
+    # Streamed entries are dropped once written, unless the diff, SQLite or a batch still need the whole list
+    keep_entries = (
+        not writers
+        or any(export_format not in ("json", "csv") for export_format in formats)
+        or previous_manga_list is not None
+        or shared_manga is not None
+    )
+
+    try:
+        result = app_export_manga_list(
+            console,
+            fetcher,
+            manga_list,
+            code,
+            settings,
+            cache=cache,
+            parse_executor=parse_executor,
+            known_manga=known_manga,
+            journal=journal,
+            journal_state=journal_state,
+            writers=writers,
+            keep_entries=keep_entries,
+        )
+    finally:
+        for writer in writers:
+            writer.close()
+
+    if not result:
+        return None
+    full_manga_list = result.manga_list
+
+    # Point exported records at local cover files
+    if settings.covers:
+        app_download_covers(console, full_manga_list, settings)
+
+    if previous_manga_list is not None:
+        manga_list_diff = diff_manga_lists(previous_manga_list, full_manga_list)
+        export_manga_list_diff_to_json(manga_list_diff, SAVE_PATH_JSON, backend=settings.json_backend, pretty=settings.pretty)
+        console.print(f"\n[blue]Changes since last export: {manga_list_diff}. Diff saved to 'saves/json' folder.[/blue]")
+
+    if "json" in formats and not settings.stream:
+        with console.status("[bold green]Exporting to JSON...", spinner="dots"):
+            export_manga_list_to_json(full_manga_list, SAVE_PATH_JSON, settings.fields, backend=settings.json_backend, pretty=settings.pretty, partial=not result.complete)
+
+    if "csv" in formats and not settings.stream:
+        with console.status("[bold green]Exporting to CSV...", spinner="dots"):
+            export_manga_list_to_csv(full_manga_list, SAVE_PATH_CSV, settings.fields)
+
+    if "sqlite" in formats:
+        with console.status("[bold green]Saving to SQLite...", spinner="dots"):
+            export_manga_list_to_sqlite(full_manga_list, SAVE_PATH_SQLITE)
+
+    METRICS.increment("entries_exported_total", result.entries)
+    return result
+
+def interactive(settings: AppSettings):
+    console.print("[bold blue]Mangago Reading List Exporter[/bold blue]")
+    console.print("[italic]Export your reading list quickly![/italic]")
+
+    cache = app_open_cache(settings)
+    parse_executor = app_open_parse_executor(settings)
+    fetcher = app_create_fetcher(settings)
+    
+    try:
+        while True:
+            try:
+                console.print("\n[bold]Options:[/bold]")
+                console.print("1. Export reading list by code")
+                console.print("2. Quit program")
+            
+                choice = Prompt.ask("\n[bold green]Choose an option[/bold green]", choices=["1", "2"])
+            
+                if choice == "1":
+                    reading_list_code = Prompt.ask("\n[bold green]Enter manga list code to export[/bold green]")
+                    if not reading_list_code:
+                        console.print("\n[red]Please enter a valid manga list code.[/red]")
+                        continue
+                
+                    manga_list, journal, journal_state = app_load_manga_list(console, fetcher, reading_list_code, settings)
+
+                    if not manga_list:
+                        console.print("\n[yellow]No manga list found.[/yellow]")
+                        continue
+                
+                    table = Table(title=f"\n{manga_list.title}")
+                    table.add_column("Creator", style="magenta")
+                    table.add_column("Date Created", style="blue")
+                    table.add_column("Pages", style="white")
+                    table.add_column("Description", style="green")
+                    table.add_column("Tags", style="yellow")
+                
+                    table.add_row(
+                        manga_list.creator,
+                        manga_list.creation_date,
+                        str(manga_list.pages),
+                        manga_list.description if manga_list.description else "N/A",
+                        ", ".join(manga_list.tags) if manga_list.tags else "N/A",
+                    )
+                    console.print(table)
+
+                    if not manga_list.entries and manga_list.pages <= 1:
+                        console.print("\n[yellow]Manga list is empty. Nothing to export.[/yellow]")
+                        continue
+
+                    # Get previous export of the same manga list
+                    previous_manga_list = find_previous_export(SAVE_PATH_JSON, manga_list, settings.fields) if settings.incremental else None
+                    if is_manga_list_unchanged(previous_manga_list, manga_list):
+                        console.print(f"\n[yellow]Manga list has not changed since its last export (last update {manga_list.last_update}). Nothing to export.[/yellow]")
+                        continue
+                
+                    console.print("\n[bold]Export Options:[/bold]")
+                    console.print("1. Export to JSON only")
+                    console.print("2. Export to CSV only")
+                    console.print("3. Export to both JSON and CSV")
+                    console.print("4. Export to SQLite database")
+                    console.print("5. Back to main menu")
+
+                    user_input = Prompt.ask("\n[bold green]Choose an option[/bold green]", choices=["1", "2", "3", "4", "5"])
+
+                    if user_input == "5":
+                        continue
+
+                    formats = {"1": ["json"], "2": ["csv"], "3": ["json", "csv"], "4": ["sqlite"]}[user_input]
+                    result = app_save_manga_list(
+                        console,
+                        fetcher,
+                        manga_list,
+                        reading_list_code,
+                        settings,
+                        formats,
+                        cache=cache,
+                        parse_executor=parse_executor,
+                        previous_manga_list=previous_manga_list,
+                        journal=journal,
+                        journal_state=journal_state,
+                    )
+                    app_write_metrics(console, settings)
+                    if not result:
+                        continue
+
+                    if user_input == "1":
+                        console.print(f"\n[green]Success! {result.entries} entries saved to 'saves/json' folder[/green].")
+                    elif user_input == "2":
+                        console.print(f"\n[green]Success! {result.entries} entries saved to 'saves/csv' folder[/green].")
+                    elif user_input == "4":
+                        console.print(f"\n[green]Success! {result.entries} entries saved to 'saves/sqlite/mangago.sqlite3'[/green].")
+                    else:
+                        console.print(f"\n[green]Success! {result.entries} entries saved to 'saves/json' and 'saves/csv' folders[/green].")
+                    continue
+            
+                elif choice == "2":
+                    break
+        
+            except Exception as e:
+                console.print(f"\n[bold red]An unexpected error occurred: {e}[/bold red]")
+            finally:
+                pass
+        
+            if not Confirm.ask("\n[bold green]Would you like to export another manga list?[/bold green]"):
+                break
+
+    finally:
+        # Close page fetcher, cache and parser processes
+        app_close_fetcher(fetcher)
+        if cache is not None:
+            cache.close()
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    console.print("\n[bold blue]Thank you for using Mangago Reading List Exporter! 📚[/bold blue]")
+
+def run_batch(settings: AppSettings, codes_file: Path, formats: List[str]):
+    invalid_formats = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+    if invalid_formats:
+        console.print(f"\n[red]Unknown export format: {', '.join(invalid_formats)}. Expected {', '.join(EXPORT_FORMATS)}.[/red]")
+        raise typer.Exit(1)
+
+    codes = read_codes_file(codes_file)
+    summary = BatchSummary(lists=len(codes))
+    shared_manga: Dict[str, Manga] = {}
+
+    cache = app_open_cache(settings)
+    parse_executor = app_open_parse_executor(settings)
+    fetcher = app_create_fetcher(settings)
+    try:
+        for index, code in enumerate(codes, start=1):
+            console.print(f"\n[bold blue]({index}/{len(codes)}) Manga list '{code}'[/bold blue]")
+
+            manga_list, journal, journal_state = app_load_manga_list(console, fetcher, code, settings)
+            if not manga_list:
+                summary.failed += 1
+                continue
+            console.print(f"[bold]{manga_list.title}[/bold] by {manga_list.creator}, {manga_list.pages} pages")
+
+            previous_manga_list = find_previous_export(SAVE_PATH_JSON, manga_list, settings.fields) if settings.incremental else None
+            if is_manga_list_unchanged(previous_manga_list, manga_list):
+                console.print(f"[yellow]Not changed since its last export (last update {manga_list.last_update}).[/yellow]")
+                summary.unchanged += 1
+                continue
+
+            # Manga already fetched for an earlier list in this batch are reused
+            shared_urls = set(shared_manga)
+            result = app_save_manga_list(
+                console,
+                fetcher,
+                manga_list,
+                code,
+                settings,
+                formats,
+                cache=cache,
+                parse_executor=parse_executor,
+                previous_manga_list=previous_manga_list,
+                shared_manga=shared_manga,
+                journal=journal,
+                journal_state=journal_state,
+            )
+            if not result:
+                summary.failed += 1
+                continue
+
+            full_manga_list = result.manga_list
+            summary.exported += 1
+            summary.entries += result.entries
+            for manga_list_entry in full_manga_list.entries:
+                if manga_list_entry.manga is None:
+                    continue
+                if manga_list_entry.url in shared_urls:
+                    summary.fetches_saved += 1
+                shared_manga[manga_list_entry.url] = manga_list_entry.manga
+            summary.unique_manga = len(shared_manga)
+            console.print(f"[green]Saved {result.entries} entries.[/green]")
+
+    finally:
+        # Close page fetcher, cache and parser processes
+        app_close_fetcher(fetcher)
+        if cache is not None:
+            cache.close()
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    app_write_metrics(console, settings)
+    console.print(f"\n[bold blue]Batch finished: {summary}.[/bold blue]")
+    if summary.failed:
+        raise typer.Exit(1)
+
+def run_watch(settings: AppSettings, codes_file: Path, formats: List[str], budget: float, min_interval: float, max_interval: float):
+    invalid_formats = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+    if invalid_formats:
+        console.print(f"\n[red]Unknown export format: {', '.join(invalid_formats)}. Expected {', '.join(EXPORT_FORMATS)}.[/red]")
+        raise typer.Exit(1)
+
+    codes = read_codes_file(codes_file)
+    request_budget = RequestBudget(budget)
+    cache = app_open_cache(settings)
+    parse_executor = app_open_parse_executor(settings)
+    fetcher = app_create_fetcher(settings, request_budget)
+
+    def on_poll(watched_list: WatchedList, e: Optional[Exception]):
+        if e is not None:
+            console.print(f"[red]Error polling manga list '{watched_list.code}': {e}[/red]")
+        else:
+            console.print(f"[dim]Polled '{watched_list.code}': last update {watched_list.last_update}, {watched_list.changes} changes in {watched_list.polls} polls, next in {watched_list.interval / 60:.0f} min[/dim]")
+
+    def on_change(code: str, manga_list: MangaList) -> bool:
+        # Lists already exported in their current state are only compared, never fetched again
+        previous_manga_list = find_previous_export(SAVE_PATH_JSON, manga_list, settings.fields)
+        if is_manga_list_exported(previous_manga_list, manga_list):
+            return True
+
+        console.print(f"\n[bold blue]Manga list '{code}' changed: {manga_list.title}, last update {manga_list.last_update}[/bold blue]")
+        try:
+            journal = ExportJournal(SAVE_PATH_JOURNAL / f"{sanitize_filename(code)}.jsonl")
+            result = app_save_manga_list(
+                console,
+                fetcher,
+                manga_list,
+                code,
+                settings,
+                formats,
+                cache=cache,
+                parse_executor=parse_executor,
+                previous_manga_list=previous_manga_list,
+                journal=journal,
+            )
+        except Exception as e:
+            console.print(f"\n[red]Error exporting manga list '{code}': {e}[/red]")
+            return False
+        app_write_metrics(console, settings)
+        if not result:
+            return False
+        console.print(f"[green]Saved {result.entries} entries.[/green]")
+        # Missing pages or entries are fetched again on the next poll
+        return result.complete
+
+    watcher = ListWatcher(
+        codes,
+        fetcher,
+        request_budget,
+        on_change,
+        parser=settings.parser,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        state_path=SAVE_PATH_WATCH,
+        on_poll=on_poll,
+    )
+    console.print(f"[bold blue]Watching {len(codes)} manga lists within {budget:.0f} requests per hour. Press Ctrl+C to stop.[/bold blue]")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Keep poll history so priorities carry over to the next watch
+        watcher.save_state()
+        app_close_fetcher(fetcher)
+        if cache is not None:
+            cache.close()
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    app_write_metrics(console, settings)
+    console.print(f"\n[bold blue]Watch stopped: {watcher.stats}, {request_budget.spent} requests.[/bold blue]")
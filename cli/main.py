@@ -1,209 +1,160 @@
 import sys
 import os
 from pathlib import Path
+from typing import List, Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 # Add src to path to import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-CURRENT_DIR = Path.cwd()
-SAVE_PATH = CURRENT_DIR / "saves"
-SAVE_PATH_JSON = SAVE_PATH / "json"
-SAVE_PATH_CSV = SAVE_PATH / "csv"
-
-from src.models import MangaList
-from src.parser import MANGA_LIST_URL_WITH_PAGE, parse_manga_list_info, get_manga_list_entries, parse_manga
-from src.exporter import export_manga_list_to_json, export_manga_list_to_csv
-
-from selenium import webdriver
-from bs4 import BeautifulSoup, Tag
+# Only light modules are imported here, the exporter itself is imported by the commands
+from src.config import (
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_COVER_WORKERS,
+    DEFAULT_JSON_BACKEND,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_PARSER_BACKEND,
+    DEFAULT_RATE,
+    DEFAULT_WATCH_BUDGET,
+    DEFAULT_WORKERS,
+    EXPORT_FORMATS,
+    FETCHER_BACKENDS,
+    JSON_BACKENDS,
+    PAGE_LOAD_TIMEOUT,
+    PARSER_BACKENDS,
+    VERSION,
+)
+from src.utils import EXPORT_FIELDS, check_fields
 
 app = typer.Typer()
-console = Console()
-
-def app_get_initial_manga_list(console: Console, code: int):
-    try:
-        # Set web driver options
-        options = webdriver.ChromeOptions()
-        options.page_load_strategy = "eager"
-        
-        # Set web driver
-        driver = webdriver.Chrome(options=options)
-        driver.set_page_load_timeout(10)
-
-        # Load first page of manga list and get manga list with info
-        with console.status("[bold green]Fetching manga details...", spinner="dots"):
-            manga_list_url = MANGA_LIST_URL_WITH_PAGE.format(manga_list_code=code, page_no=1)
-            driver.get(manga_list_url)
-            manga_list_first_page_soup = BeautifulSoup(driver.page_source, "html.parser")
-            manga_list = parse_manga_list_info(manga_list_first_page_soup)
-            manga_list.url = manga_list_url
 
-        # Get manga list entries for each page
-        with Progress(SpinnerColumn(), TextColumn("Preparing manga list entries..."), BarColumn(), console=console) as progress:
-            task = progress.add_task("Fetching entries...", total=manga_list.pages)
-            manga_list_entries = []
-            for page in range(1, manga_list.pages + 1):
-                try: 
-                    manga_list_entries.extend(get_manga_list_entries(driver, code, page))
-                    progress.update(task, advance=1)
-                except Exception as e:
-                    console.print(f"\n[red]Error fetching manga list entries for page {page}: {e}[/red]")
-                    break
-        
-        # Set manga list entries
-        manga_list.entries = manga_list_entries
+def show_version(value: bool):
+    if value:
+        typer.echo(f"Mangago Reading List Exporter {VERSION}")
+        raise typer.Exit()
+
+@app.callback(invoke_without_command=True)
+def main(
+    ctx: typer.Context,
+    workers: int = typer.Option(DEFAULT_WORKERS, "--workers", "-w", min=1, help="Number of manga pages fetched concurrently."),
+    page_workers: Optional[int] = typer.Option(None, "--page-workers", min=1, help="Number of list pages fetched concurrently. Defaults to --workers."),
+    backend: str = typer.Option("auto", "--backend", "-b", help=f"Page fetcher backend: {', '.join(FETCHER_BACKENDS)}. 'auto' uses plain HTTP and falls back to Chrome."),
+    headless: bool = typer.Option(True, "--headless/--headed", help="Run Chrome without a visible window."),
+    block_resources: bool = typer.Option(True, "--block-resources/--load-resources", help="Stop Chrome from loading images, media, fonts, stylesheets and ad or tracking domains."),
+    chrome_cache_dir: Optional[Path] = typer.Option(None, "--chrome-cache-dir", help="Directory Chrome keeps its disk cache in between runs."),
+    page_load_timeout: float = typer.Option(PAGE_LOAD_TIMEOUT, "--page-load-timeout", min=1, help="Seconds to wait for a page to load."),
+    rate: float = typer.Option(DEFAULT_RATE, "--rate", min=0.1, help="Maximum page requests per second. Slows down automatically when the site starts failing."),
+    max_retries: int = typer.Option(DEFAULT_MAX_RETRIES, "--max-retries", min=0, help="Times a timed out, throttled or failed page request is retried."),
+    parser: str = typer.Option(DEFAULT_PARSER_BACKEND, "--parser", "-p", help=f"HTML parser backend: {', '.join(PARSER_BACKENDS)}. 'lxml' is faster but needs the lxml package."),
+    parse_workers: int = typer.Option(0, "--parse-workers", min=0, help="Number of processes parsing pages in parallel with fetching. 0 parses on the fetching threads."),
+    use_cache: bool = typer.Option(True, "--cache/--no-cache", help="Reuse manga details cached by previous exports."),
+    cache_ttl: float = typer.Option(DEFAULT_CACHE_TTL / 3600, "--cache-ttl", min=0, help="Hours before a cached manga is fetched again."),
+    cache_size: int = typer.Option(DEFAULT_CACHE_SIZE, "--cache-size", min=1, help="Maximum number of cached manga, least recently used are evicted first."),
+    incremental: bool = typer.Option(False, "--incremental", help="Compare against the latest JSON export: skip unchanged lists, only fetch new entries and save a diff."),
+    resume: bool = typer.Option(False, "--resume", help="Continue an interrupted export of the same list code from its saved progress."),
+    stream: bool = typer.Option(False, "--stream", help="Write JSON Lines and CSV rows as soon as each entry is fetched instead of once at the end."),
+    compress: bool = typer.Option(False, "--gzip", help="Compress streamed JSON Lines exports with gzip."),
+    json_backend: str = typer.Option(DEFAULT_JSON_BACKEND, "--json-backend", help=f"JSON encoder: {', '.join(JSON_BACKENDS)}. 'auto' uses msgspec, or orjson for --compact, when installed and the standard library otherwise."),
+    pretty: bool = typer.Option(True, "--pretty/--compact", help="Indent JSON exports, or write them on a single line."),
+    archive: bool = typer.Option(False, "--archive", help="Store every fetched page compressed in 'saves/archive' so it can be parsed again with --replay."),
+    replay: bool = typer.Option(False, "--replay", help="Parse pages stored with --archive instead of fetching them. Never touches the network."),
+    covers: bool = typer.Option(False, "--covers", help="Download cover images to 'saves/covers' and add their paths to the exported records. Not available with --stream."),
+    cover_workers: int = typer.Option(DEFAULT_COVER_WORKERS, "--cover-workers", min=1, help="Number of cover images downloaded concurrently."),
+    fields: Optional[str] = typer.Option(None, "--fields", help=f"Comma separated fields to export, any of: {', '.join(EXPORT_FIELDS)}. Manga pages are not fetched when no manga_ field is selected."),
+    metrics_path: Optional[Path] = typer.Option(None, "--metrics", help="Write counts and latency histograms of every stage to this file after each export. Prometheus textfile format for .prom files, JSON otherwise."),
+    version: bool = typer.Option(False, "--version", callback=show_version, is_eager=True, help="Show the version and exit."),
+):
+    """
+    Interactive CLI for exporting reading list from Mangago.me
+    """
 
-        return manga_list
-    
-    except Exception as e:
-        console.print(f"\n[red]Error fetching manga list: {e}[/red]")
-    
-    finally:
-        # Close web driver
-        driver.quit()
+    # Options are parsed and --help is shown before the exporter is loaded
+    from cli.commands import AppSettings, console, interactive
+    from src.exporter import check_json_backend
+    from src.fetcher import ChromeProfile
+    from src.parser import check_parser_backend
 
-def app_assign_manga_to_manga_list_entries(console: Console, manga_list: MangaList):
+    selected_fields = [field.strip() for field in fields.split(",") if field.strip()] if fields is not None else None
     try:
-        # Set web driver options
-        options = webdriver.ChromeOptions()
-        options.page_load_strategy = "eager"
-        
-        # Set web driver
-        driver = webdriver.Chrome(options=options)
-        driver.set_page_load_timeout(10)
-
-        with Progress(SpinnerColumn(), TextColumn("Preparing manga details..."), BarColumn(), console=console) as progress:
-            task = progress.add_task("Fetching details...", total=len(manga_list.entries))
-            for manga_list_entry in manga_list.entries:
-                driver.get(manga_list_entry.url)
-                manga_soup = BeautifulSoup(driver.page_source, "html.parser")
-                manga = parse_manga(manga_soup)
-                manga.url = manga_list_entry.url
-                manga_list_entry.manga = manga
-
-                progress.update(task, advance=1)
-
-        return manga_list
-    
-    except Exception as e:
-        console.print(f"\n[red]Error fetching manga details: {e}[/red]")
-    
-    finally:
-        # Close web driver
-        driver.quit()
+        check_parser_backend(parser)
+        check_json_backend(json_backend)
+        if selected_fields is not None:
+            check_fields(selected_fields)
+    except ValueError as e:
+        console.print(f"\n[red]{e}[/red]")
+        raise typer.Exit(1)
+    # Streamed rows are written before their covers could be downloaded
+    if covers and stream:
+        console.print("\n[red]--covers cannot be combined with --stream, streamed rows would have no cover paths.[/red]")
+        raise typer.Exit(1)
+
+    ctx.obj = AppSettings(
+        workers=workers,
+        page_workers=page_workers,
+        backend=backend,
+        chrome_profile=ChromeProfile(
+            headless=headless,
+            block_resources=block_resources,
+            disk_cache_dir=str(chrome_cache_dir) if chrome_cache_dir else None,
+            page_load_timeout=page_load_timeout,
+        ),
+        rate=rate,
+        max_retries=max_retries,
+        parser=parser,
+        parse_workers=parse_workers,
+        use_cache=use_cache,
+        cache_ttl=cache_ttl * 3600,
+        cache_size=cache_size,
+        incremental=incremental,
+        resume=resume,
+        stream=stream,
+        compress=compress,
+        archive=archive,
+        replay=replay,
+        metrics_path=metrics_path,
+        fields=selected_fields,
+        json_backend=json_backend,
+        pretty=pretty,
+        covers=covers,
+        cover_workers=cover_workers,
+    )
+
+    # Commands such as batch run on their own
+    if ctx.invoked_subcommand is None:
+        interactive(ctx.obj)
 
 @app.command()
-def main():
+def batch(
+    ctx: typer.Context,
+    codes_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Text file with one manga list code per line."),
+    formats: List[str] = typer.Option(["json"], "--format", "-f", help=f"Export format, repeatable: {', '.join(EXPORT_FORMATS)}."),
+):
     """
-    Interactive CLI for exporting reading list from Mangago.me
+    Export every manga list code in a file without prompts, fetching manga shared between lists only once
     """
-    
-    console.print("[bold blue]Mangago Reading List Exporter[/bold blue]")
-    console.print("[italic]Export your reading list quickly![/italic]")
-    
-    while True:
-        try:
-            console.print("\n[bold]Options:[/bold]")
-            console.print("1. Export reading list by code")
-            console.print("2. Quit program")
-            
-            choice = Prompt.ask("\n[bold green]Choose an option[/bold green]", choices=["1", "2"])
-            
-            if choice == "1":
-                reading_list_code = Prompt.ask("\n[bold green]Enter manga list code to export[/bold green]")
-                if not reading_list_code:
-                    console.print("\n[red]Please enter a valid manga list code.[/red]")
-                    continue
-                
-                with console.status(f"[bold green]Searching for manga list with code '{reading_list_code}'...[/bold green]"):
-                    manga_list = app_get_initial_manga_list(console, reading_list_code)
-
-                if not manga_list:
-                    console.print("\n[yellow]No manga list found.[/yellow]")
-                    continue
-                
-                table = Table(title=f"\n{manga_list.title}")
-                table.add_column("Creator", style="magenta")
-                table.add_column("Date Created", style="blue")
-                table.add_column("Entries", style="white")
-                table.add_column("Description", style="green")
-                table.add_column("Tags", style="yellow")
-                
-                table.add_row(
-                    manga_list.creator,
-                    manga_list.creation_date,
-                    str(len(manga_list.entries)),
-                    manga_list.description if manga_list.description else "N/A",
-                    ", ".join(manga_list.tags) if manga_list.tags else "N/A",
-                )
-                console.print(table)
-
-                if not manga_list.entries:
-                    console.print("\n[yellow]Manga list is empty. Nothing to export.[/yellow]")
-                    continue
-                
-                console.print("\n[bold]Export Options:[/bold]")
-                console.print("1. Export to JSON only")
-                console.print("2. Export to CSV only")
-                console.print("3. Export to both JSON and CSV")
-                console.print("4. Back to main menu")
+    from cli.commands import run_batch
 
-                user_input = Prompt.ask("\n[bold green]Choose an option[/bold green]", choices=["1", "2", "3", "4"])
+    run_batch(ctx.obj, codes_file, formats)
 
-                if user_input == "1":
-                    with console.status("[bold green]Searching for manga details", spinner="dots"):
-                        full_manga_list = app_assign_manga_to_manga_list_entries(console, manga_list)
-
-                    with console.status("[bold green]Exporting to JSON...", spinner="dots"):
-                        export_manga_list_to_json(full_manga_list, SAVE_PATH_JSON)
-                    
-                    console.print("\n[green]Success! Export file saved to 'saves/json' folder[/green].")
-                    continue
-                
-                elif user_input == "2":
-                    with console.status("[bold green]Searching for manga details", spinner="dots"):
-                        full_manga_list = app_assign_manga_to_manga_list_entries(console, manga_list)
-                    
-                    with console.status("[bold green]Exporting to CSV...", spinner="dots"):
-                        export_manga_list_to_csv(full_manga_list, SAVE_PATH_CSV)
-                    
-                    console.print("\n[green]Success! Export file saved to 'saves/csv' folder[/green].")
-                    continue
+@app.command()
+def watch(
+    ctx: typer.Context,
+    codes_file: Path = typer.Argument(..., exists=True, dir_okay=False, help="Text file with one manga list code per line."),
+    formats: List[str] = typer.Option(["json"], "--format", "-f", help=f"Export format, repeatable: {', '.join(EXPORT_FORMATS)}."),
+    budget: float = typer.Option(DEFAULT_WATCH_BUDGET, "--budget", min=1, help="Maximum page requests per hour, polls and re-exports included."),
+    min_interval: float = typer.Option(DEFAULT_MIN_POLL_INTERVAL / 60, "--min-interval", min=0, help="Minutes between polls of the same list, however often it changes."),
+    max_interval: float = typer.Option(DEFAULT_MAX_POLL_INTERVAL / 3600, "--max-interval", min=0, help="Hours before any list is polled again, however rarely it changes."),
+):
+    """
+    Keep every manga list code in a file in sync, polling lists that change often more often and exporting a list again only when it changed
+    """
+    from cli.commands import run_watch
 
-                elif user_input == "3":
-                    with console.status("[bold green]Searching for manga details", spinner="dots"):
-                        full_manga_list = app_assign_manga_to_manga_list_entries(console, manga_list)
-                    
-                    with console.status("[bold green]Exporting to JSON...", spinner="dots"):
-                        export_manga_list_to_json(full_manga_list, SAVE_PATH_JSON)
-                    
-                    with console.status("[bold green]Exporting to CSV...", spinner="dots"):
-                        export_manga_list_to_csv(full_manga_list, SAVE_PATH_CSV)
-                    
-                    console.print("\n[green]Success! Export files saved to 'saves/json' and 'saves/csv' folders[/green].")
-                    continue
-                
-                elif user_input == "4":
-                    continue
-            
-            elif choice == "2":
-                break
-        
-        except Exception as e:
-            console.print(f"\n[bold red]An unexpected error occurred: {e}[/bold red]")
-        finally:
-            pass
-        
-        if not Confirm.ask("\n[bold green]Would you like to export another manga list?[/bold green]"):
-            break
-    
-    console.print("\n[bold blue]Thank you for using Mangago Reading List Exporter! 📚[/bold blue]")
+    run_watch(ctx.obj, codes_file, formats, budget, min_interval * 60, max_interval * 3600)
 
 if __name__ == "__main__":
     app()
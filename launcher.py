@@ -10,6 +10,8 @@ import argparse
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+from src.config import VERSION
+
 def main():
     """Main launcher function."""
     parser = argparse.ArgumentParser(
@@ -36,17 +38,18 @@ For more information, visit: https://github.com/jmbacasno/Mangago-Reading-List-E
     parser.add_argument(
         "--version", 
         action="version", 
-        version="Mangago Reading List Exporter 1.0.0"
+        version=f"Mangago Reading List Exporter {VERSION}"
     )
     
-    args = parser.parse_args()
+    # Everything else is passed on to the CLI, e.g. --workers 8 batch codes.txt
+    args, cli_args = parser.parse_known_args()
     args.cli = True
     
     if args.cli:
         print("⌨️  Launching CLI interface...\n")
         try:
             from cli.main import app
-            app()
+            app(args=cli_args)
             return 0
         except ImportError as e:
             print(f"❌ Failed to launch CLI: {e}")
@@ -0,0 +1,149 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .fetcher import FetchError, Fetcher
+
+@dataclass
+class ArchiveStats:
+    stored: int = 0
+    deduplicated: int = 0
+    read: int = 0
+    missing: int = 0
+
+    def __str__(self):
+        return f"{self.stored} pages stored, {self.deduplicated} unchanged, {self.read} read, {self.missing} missing"
+
+class HtmlArchive:
+    """
+    Raw pages stored as gzip compressed blobs named after the SHA-256 of their
+    content, with a SQLite index from URL to the latest blob.
+
+    Identical pages share one blob, so archiving the same list again only adds
+    index rows for pages that changed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.blobs_path = self.path / "blobs"
+        self.stats = ArchiveStats()
+        self._lock = threading.Lock()
+
+        self.blobs_path.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, "
+            "hash TEXT NOT NULL, "
+            "archived_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blobs_path / digest[:2] / f"{digest}.html.gz"
+
+    def put(self, url: str, html: str) -> str:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        stored = not blob_path.exists()
+        if stored:
+            # Write to a temporary file first so a crash never leaves a truncated blob
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=blob_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data))
+            os.replace(tmp_path, blob_path)
+
+        with self._lock:
+            if stored:
+                self.stats.stored += 1
+            else:
+                self.stats.deduplicated += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, hash, archived_at) VALUES (?, ?, ?)",
+                (url, digest, time.time()),
+            )
+            self._conn.commit()
+        return digest
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT hash FROM pages WHERE url = ?", (url,)).fetchone()
+            blob_path = self._blob_path(row[0]) if row is not None else None
+            if blob_path is None or not blob_path.exists():
+                self.stats.missing += 1
+                return None
+            self.stats.read += 1
+        return gzip.decompress(blob_path.read_bytes()).decode("utf-8")
+
+    def urls(self) -> List[str]:
+        with self._lock:
+            return [url for (url,) in self._conn.execute("SELECT url FROM pages ORDER BY url")]
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM pages WHERE url = ?", (url,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ArchivingFetcher(Fetcher):
+    """
+    Stores every page the wrapped fetcher returns in an HtmlArchive.
+    """
+
+    def __init__(self, fetcher: Fetcher, archive: HtmlArchive):
+        self.fetcher = fetcher
+        self.archive = archive
+
+    def fetch(self, url: str) -> str:
+        html = self.fetcher.fetch(url)
+        self.archive.put(url, html)
+        return html
+
+    def close(self):
+        self.fetcher.close()
+
+class ReplayFetcher(Fetcher):
+    """
+    Serves pages from an HtmlArchive without touching the network. Pages that
+    were never archived fail like a missing page would.
+    """
+
+    def __init__(self, archive: HtmlArchive):
+        self.archive = archive
+
+    def fetch(self, url: str) -> str:
+        html = self.archive.get(url)
+        if html is None:
+            raise FetchError(url, status=404, message="Page not in archive")
+        return html
+
+def get_archive(fetcher: Fetcher) -> Optional[HtmlArchive]:
+    # Walk wrapped fetchers until one reads from or writes to an archive
+    while fetcher is not None:
+        if isinstance(getattr(fetcher, "archive", None), HtmlArchive):
+            return fetcher.archive
+        fetcher = getattr(fetcher, "fetcher", None)
+    return None
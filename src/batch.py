@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+@dataclass
+class BatchSummary:
+    lists: int = 0
+    exported: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    entries: int = 0
+    unique_manga: int = 0
+    fetches_saved: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.exported} of {self.lists} lists exported ({self.unchanged} unchanged, {self.failed} failed), "
+            f"{self.entries} entries, {self.unique_manga} unique manga, {self.fetches_saved} detail fetches saved by deduplication"
+        )
+
+def read_codes_file(path) -> List[str]:
+    # One list code per line, blank lines and "#" comments are ignored
+    codes = {}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        code = line.split("#", 1)[0].strip()
+        if code:
+            codes.setdefault(code, None)
+    return list(codes)
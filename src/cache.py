@@ -0,0 +1,122 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from .config import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL
+from .models import Manga
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate), {self.expired} expired, {self.evictions} evicted"
+
+class MangaCache:
+    """
+    Persistent SQLite cache of parsed Manga records keyed by manga URL.
+
+    Records older than `ttl` seconds are treated as misses. Once the cache
+    holds more than `max_entries` records, the least recently used ones are
+    evicted.
+    """
+
+    def __init__(self, path, ttl: Optional[float] = DEFAULT_CACHE_TTL, max_entries: Optional[int] = DEFAULT_CACHE_SIZE):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS manga ("
+            "url TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS manga_accessed_at ON manga (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Manga]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, created_at FROM manga WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            data, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM manga WHERE url = ?", (url,))
+                self._conn.commit()
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE manga SET accessed_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+            self.stats.hits += 1
+
+        return Manga(**json.loads(data))
+
+    def put(self, manga: Manga):
+        if not manga.url:
+            return
+
+        now = time.time()
+        data = json.dumps(asdict(manga), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manga (url, data, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (manga.url, data, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM manga").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM manga WHERE url IN (SELECT url FROM manga ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.stats.evictions += excess
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM manga").fetchone()
+        return count
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM manga")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
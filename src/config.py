@@ -0,0 +1,26 @@
+import os
+
+# Defaults shared by the CLI and the modules behind it. Kept free of third
+# party imports so the CLI can build its options without loading them.
+
+VERSION = "1.0.0"
+
+# Overridable to point the exporter at a local stand-in server
+MANGAGO_BASE_URL = os.environ.get("MANGAGO_BASE_URL", "https://www.mangago.me").rstrip("/")
+
+DEFAULT_WORKERS = 4
+PAGE_LOAD_TIMEOUT = 10
+FETCHER_BACKENDS = ("auto", "http", "selenium")
+PARSER_BACKENDS = ("html.parser", "lxml")
+DEFAULT_PARSER_BACKEND = "html.parser"
+DEFAULT_RATE = 4.0
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_CACHE_SIZE = 50000
+DEFAULT_COVER_WORKERS = 8
+EXPORT_FORMATS = ("json", "csv", "sqlite")
+JSON_BACKENDS = ("auto", "json", "orjson", "msgspec")
+DEFAULT_JSON_BACKEND = "auto"
+DEFAULT_WATCH_BUDGET = 600
+DEFAULT_MIN_POLL_INTERVAL = 5 * 60
+DEFAULT_MAX_POLL_INTERVAL = 24 * 60 * 60
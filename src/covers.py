@@ -0,0 +1,179 @@
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import DEFAULT_COVER_WORKERS, MANGAGO_BASE_URL, PAGE_LOAD_TIMEOUT
+from .fetcher import USER_AGENT
+from .metrics import METRICS
+from .models import MangaList
+
+COVER_EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+@dataclass
+class CoverStats:
+    downloaded: int = 0
+    deduplicated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+
+    def __str__(self):
+        return f"{self.downloaded} downloaded ({self.bytes / 1024 / 1024:.1f} MiB), {self.deduplicated} identical to a stored cover, {self.skipped} already stored, {self.failed} failed"
+
+def get_cover_extension(url: str, content_type: Optional[str]) -> str:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in COVER_EXTENSIONS:
+        return COVER_EXTENSIONS[content_type]
+    extension = os.path.splitext(urlparse(url).path)[1].lower()
+    return extension if mimetypes.types_map.get(extension, "").startswith("image/") else ".img"
+
+class CoverStore:
+    """
+    Cover images stored once under the SHA-256 of their content, with a SQLite
+    index from cover URL to file. Covers already in the index are never
+    downloaded again, and covers with identical bytes share one file.
+
+    Paths handed out are relative to the store folder.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.stats = CoverStats()
+        self._lock = threading.Lock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS covers ("
+            "url TEXT PRIMARY KEY, "
+            "path TEXT NOT NULL, "
+            "downloaded_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM covers WHERE url = ?", (url,)).fetchone()
+        if row is None or not (self.path / row[0]).exists():
+            return None
+        return row[0]
+
+    def put(self, url: str, data: bytes, extension: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        relative_path = f"{digest[:2]}/{digest}{extension}"
+        file_path = self.path / relative_path
+
+        stored = not file_path.exists()
+        if stored:
+            # Write to a temporary file first so a crash never leaves a truncated image
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+
+        with self._lock:
+            if stored:
+                self.stats.downloaded += 1
+                self.stats.bytes += len(data)
+            else:
+                self.stats.deduplicated += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO covers (url, path, downloaded_at) VALUES (?, ?, ?)",
+                (url, relative_path, time.time()),
+            )
+            self._conn.commit()
+        return relative_path
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def create_cover_session(workers: int = DEFAULT_COVER_WORKERS) -> requests.Session:
+    # One keep-alive connection per worker, throttling and server errors are retried with backoff
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT, "Referer": f"{MANGAGO_BASE_URL}/"})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=max(1, workers), pool_maxsize=max(1, workers), max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def _download_cover(session: requests.Session, store: CoverStore, url: str) -> str:
+    with METRICS.timed("cover_download_seconds"):
+        response = session.get(url, timeout=PAGE_LOAD_TIMEOUT)
+    response.raise_for_status()
+    return store.put(url, response.content, get_cover_extension(url, response.headers.get("Content-Type")))
+
+def download_covers(
+    manga_list: MangaList,
+    store: CoverStore,
+    workers: int = DEFAULT_COVER_WORKERS,
+    session: Optional[requests.Session] = None,
+    on_cover: Optional[Callable[[str, Optional[Exception]], None]] = None,
+) -> Dict[str, str]:
+    """
+    Download the cover of every manga in the list concurrently and point each
+    manga's `cover_path` at its stored file. Every cover URL is downloaded at
+    most once, and not at all when the store already has it.
+    """
+    cover_urls = {
+        manga_list_entry.manga.cover_url
+        for manga_list_entry in manga_list.entries
+        if manga_list_entry.manga is not None and manga_list_entry.manga.cover_url
+    }
+
+    paths = {}
+    missing_urls = []
+    for url in sorted(cover_urls):
+        path = store.get(url)
+        if path is None:
+            missing_urls.append(url)
+            continue
+        paths[url] = path
+        store.stats.skipped += 1
+        if on_cover:
+            on_cover(url, None)
+
+    own_session = session is None
+    session = session or create_cover_session(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {url: executor.submit(_download_cover, session, store, url) for url in missing_urls}
+            for url, future in futures.items():
+                try:
+                    paths[url] = future.result()
+                    if on_cover:
+                        on_cover(url, None)
+                except Exception as e:
+                    store.stats.failed += 1
+                    if on_cover:
+                        on_cover(url, e)
+    finally:
+        if own_session:
+            session.close()
+
+    for manga_list_entry in manga_list.entries:
+        manga = manga_list_entry.manga
+        if manga is not None and manga.cover_url in paths:
+            manga.cover_path = paths[manga.cover_url]
+    return paths
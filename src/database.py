@@ -0,0 +1,221 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from .models import Manga, MangaList
+
+# Keeps IN (...) queries under SQLite's bound parameter limit
+CHUNK_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS manga_lists (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    creator TEXT,
+    creation_date TEXT,
+    last_update TEXT,
+    description TEXT,
+    pages INTEGER,
+    exported_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manga_list_tags (
+    list_id INTEGER NOT NULL REFERENCES manga_lists (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (list_id, tag)
+);
+CREATE TABLE IF NOT EXISTS manga (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    cover_url TEXT,
+    cover_path TEXT,
+    author TEXT,
+    summary TEXT,
+    status TEXT,
+    released_year INTEGER,
+    rating REAL,
+    votes INTEGER,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manga_author ON manga (author);
+CREATE INDEX IF NOT EXISTS manga_rating ON manga (rating);
+CREATE TABLE IF NOT EXISTS manga_alternatives (
+    manga_id INTEGER NOT NULL REFERENCES manga (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    PRIMARY KEY (manga_id, position)
+);
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS manga_genres (
+    manga_id INTEGER NOT NULL REFERENCES manga (id) ON DELETE CASCADE,
+    genre_id INTEGER NOT NULL REFERENCES genres (id),
+    PRIMARY KEY (manga_id, genre_id)
+);
+CREATE INDEX IF NOT EXISTS manga_genres_genre ON manga_genres (genre_id);
+CREATE TABLE IF NOT EXISTS entries (
+    list_id INTEGER NOT NULL REFERENCES manga_lists (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url TEXT,
+    manga_id INTEGER REFERENCES manga (id),
+    comment TEXT,
+    add_date TEXT,
+    PRIMARY KEY (list_id, position)
+);
+CREATE INDEX IF NOT EXISTS entries_url ON entries (url);
+CREATE INDEX IF NOT EXISTS entries_manga ON entries (manga_id);
+"""
+
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS manga_fts USING fts5 (title, alternatives, summary)"
+
+def _chunks(items: List, size: int = CHUNK_SIZE) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class MangaDatabase:
+    """
+    SQLite database of exported manga lists, with normalized tables for lists,
+    entries, manga and genres.
+
+    Saving a list upserts its manga and replaces its entries in a single
+    transaction, so exporting the same list again updates it in place. Titles,
+    alternative titles and summaries are searchable through an FTS5 index
+    when SQLite is built with FTS5.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+        # Databases created before covers were downloaded
+        manga_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(manga)")}
+        if "cover_path" not in manga_columns:
+            self._conn.execute("ALTER TABLE manga ADD COLUMN cover_path TEXT")
+        try:
+            self._conn.execute(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        self._conn.commit()
+
+    def _get_ids(self, table: str, column: str, values: List[str]) -> Dict[str, int]:
+        ids = {}
+        for chunk in _chunks(values):
+            placeholders = ", ".join("?" * len(chunk))
+            ids.update(self._conn.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({placeholders})", chunk).fetchall())
+        return ids
+
+    def _save_manga(self, manga: List[Manga], now: float) -> Dict[str, int]:
+        self._conn.executemany(
+            "INSERT INTO manga (url, title, cover_url, cover_path, author, summary, status, released_year, rating, votes, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (url) DO UPDATE SET "
+            "title = excluded.title, cover_url = excluded.cover_url, cover_path = coalesce(excluded.cover_path, manga.cover_path), author = excluded.author, summary = excluded.summary, "
+            "status = excluded.status, released_year = excluded.released_year, rating = excluded.rating, "
+            "votes = excluded.votes, updated_at = excluded.updated_at",
+            [
+                (m.url, m.title, m.cover_url, m.cover_path, m.author, m.summary, m.status, m.released_year, m.rating, m.votes, now)
+                for m in manga
+            ],
+        )
+        manga_ids = self._get_ids("manga", "url", [m.url for m in manga])
+        ids = list(manga_ids.values())
+
+        # Replace genres, alternative titles and search rows of every saved manga
+        for chunk in _chunks(ids):
+            placeholders = ", ".join("?" * len(chunk))
+            self._conn.execute(f"DELETE FROM manga_genres WHERE manga_id IN ({placeholders})", chunk)
+            self._conn.execute(f"DELETE FROM manga_alternatives WHERE manga_id IN ({placeholders})", chunk)
+            if self.has_fts:
+                self._conn.execute(f"DELETE FROM manga_fts WHERE rowid IN ({placeholders})", chunk)
+
+        genre_names = sorted({genre for m in manga for genre in m.genres})
+        self._conn.executemany("INSERT OR IGNORE INTO genres (name) VALUES (?)", [(name,) for name in genre_names])
+        genre_ids = self._get_ids("genres", "name", genre_names)
+
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO manga_genres (manga_id, genre_id) VALUES (?, ?)",
+            [(manga_ids[m.url], genre_ids[genre]) for m in manga for genre in m.genres],
+        )
+        self._conn.executemany(
+            "INSERT INTO manga_alternatives (manga_id, position, title) VALUES (?, ?, ?)",
+            [(manga_ids[m.url], position, title) for m in manga for position, title in enumerate(m.alternatives)],
+        )
+        if self.has_fts:
+            self._conn.executemany(
+                "INSERT INTO manga_fts (rowid, title, alternatives, summary) VALUES (?, ?, ?, ?)",
+                [(manga_ids[m.url], m.title, "; ".join(m.alternatives), m.summary) for m in manga],
+            )
+        return manga_ids
+
+    def save_manga_list(self, manga_list: MangaList):
+        now = time.time()
+        # One manga per URL, lists often share titles
+        manga = list({
+            manga_list_entry.manga.url: manga_list_entry.manga
+            for manga_list_entry in manga_list.entries
+            if manga_list_entry.manga is not None and manga_list_entry.manga.url
+        }.values())
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO manga_lists (url, title, creator, creation_date, last_update, description, pages, exported_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET "
+                "title = excluded.title, creator = excluded.creator, creation_date = excluded.creation_date, "
+                "last_update = excluded.last_update, description = excluded.description, pages = excluded.pages, "
+                "exported_at = excluded.exported_at",
+                (manga_list.url, manga_list.title, manga_list.creator, manga_list.creation_date, manga_list.last_update, manga_list.description, manga_list.pages, now),
+            )
+            (list_id,) = self._conn.execute("SELECT id FROM manga_lists WHERE url = ?", (manga_list.url,)).fetchone()
+
+            self._conn.execute("DELETE FROM manga_list_tags WHERE list_id = ?", (list_id,))
+            self._conn.executemany("INSERT OR IGNORE INTO manga_list_tags (list_id, tag) VALUES (?, ?)", [(list_id, tag) for tag in manga_list.tags])
+
+            manga_ids = self._save_manga(manga, now)
+
+            # Entries are replaced as a whole so removed entries disappear too
+            self._conn.execute("DELETE FROM entries WHERE list_id = ?", (list_id,))
+            self._conn.executemany(
+                "INSERT INTO entries (list_id, position, url, manga_id, comment, add_date) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (list_id, position, manga_list_entry.url, manga_ids.get(manga_list_entry.manga.url) if manga_list_entry.manga else None, manga_list_entry.comment, manga_list_entry.add_date)
+                    for position, manga_list_entry in enumerate(manga_list.entries)
+                ],
+            )
+
+    def search(self, query: str, limit: int = 20) -> List[Manga]:
+        if not self.has_fts:
+            raise RuntimeError("Full-text search needs SQLite built with FTS5")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT m.url, m.title, m.cover_url, m.cover_path, m.author, m.summary, m.status, m.released_year, m.rating, m.votes "
+                "FROM manga_fts JOIN manga m ON m.id = manga_fts.rowid "
+                "WHERE manga_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        return [
+            Manga(url=url, title=title, cover_url=cover_url, cover_path=cover_path, author=author, summary=summary, status=status, released_year=released_year, rating=rating, votes=votes)
+            for url, title, cover_url, cover_path, author, summary, status, released_year, rating, votes in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,21 +1,81 @@
 import json
 import csv
+import gzip
+import importlib.util
 import time
-from dataclasses import asdict
+from typing import Any, List, Optional
 
-from .models import MangaList
-from .utils import manga_list_custom_csv_dict, sanitize_filename
+from .config import DEFAULT_JSON_BACKEND, JSON_BACKENDS
+from .database import MangaDatabase
+from .incremental import MangaListDiff
+from .metrics import METRICS
+from .models import MangaList, MangaListEntry
+from .utils import CSV_FIELDNAMES, manga_list_custom_csv_dict, manga_list_dict, manga_list_entry_custom_csv_dict, manga_list_entry_dict, sanitize_filename
 
-def export_manga_list_to_json(manga_list: MangaList, path_folder: str):
+# Seconds between flushes of streamed JSON Lines, each gzip flush ends a compression block
+STREAM_FLUSH_INTERVAL = 1.0
+
+def check_json_backend(backend: str):
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{backend}', expected one of: {', '.join(JSON_BACKENDS)}")
+    if backend in ("orjson", "msgspec") and importlib.util.find_spec(backend) is None:
+        raise ValueError(f"JSON backend '{backend}' needs the {backend} package: pip install {backend}")
+
+def get_json_backend(backend: str = DEFAULT_JSON_BACKEND, pretty: bool = True) -> str:
+    # Fastest installed backend, the standard library otherwise. orjson only
+    # indents by 2 spaces, so pretty output never picks it unless asked to.
+    if backend != "auto":
+        return backend
+    for candidate in (("msgspec",) if pretty else ("orjson", "msgspec")):
+        if importlib.util.find_spec(candidate) is not None:
+            return candidate
+    return "json"
+
+def _json_default(obj: Any):
+    # Dataclasses are encoded one level at a time instead of deep copied by asdict
+    if hasattr(obj, "__dataclass_fields__"):
+        return {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(data: Any, backend: str = DEFAULT_JSON_BACKEND, pretty: bool = True) -> bytes:
+    """
+    Encode data to UTF-8 JSON. Dataclasses such as `MangaList` are encoded
+    directly, orjson and msgspec do it in C without building dicts first.
+
+    Pretty output is indented by 4 spaces, except with orjson which only
+    supports 2 and is therefore only picked by `auto` for compact output.
+    """
+    backend = get_json_backend(backend, pretty)
+    if backend == "orjson":
+        import orjson
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if backend == "msgspec":
+        import msgspec
+        encoded = msgspec.json.encode(data)
+        return msgspec.json.format(encoded, indent=4) if pretty else encoded
+    if pretty:
+        return json.dumps(data, default=_json_default, indent=4, ensure_ascii=False).encode("utf-8")
+    return json.dumps(data, default=_json_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+@METRICS.timed("export_seconds", format="json")
+def export_manga_list_to_json(manga_list: MangaList, path_folder: str, fields: Optional[List[str]] = None, backend: str = DEFAULT_JSON_BACKEND, pretty: bool = True, partial: bool = False):
     filename = f"{path_folder}/{sanitize_filename(manga_list.title)}_{time.strftime('%Y%m%d%H%M%S')}.json"
-    data = asdict(manga_list)
+    # Full exports are encoded straight from the models, projections and partial exports need their own dicts
+    data = manga_list if fields is None and not partial else manga_list_dict(manga_list, fields, partial)
     if data:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        with open(filename, "wb") as f:
+            f.write(encode_json(data, backend, pretty))
 
-def export_manga_list_to_csv(manga_list: MangaList, path_folder: str):
+@METRICS.timed("export_seconds", format="json_diff")
+def export_manga_list_diff_to_json(manga_list_diff: MangaListDiff, path_folder: str, backend: str = DEFAULT_JSON_BACKEND, pretty: bool = True):
+    filename = f"{path_folder}/{sanitize_filename(manga_list_diff.title)}_diff_{time.strftime('%Y%m%d%H%M%S')}.json"
+    with open(filename, "wb") as f:
+        f.write(encode_json(manga_list_diff, backend, pretty))
+
+@METRICS.timed("export_seconds", format="csv")
+def export_manga_list_to_csv(manga_list: MangaList, path_folder: str, fields: Optional[List[str]] = None):
     filename = f"{path_folder}/{sanitize_filename(manga_list.title)}_{time.strftime('%Y%m%d%H%M%S')}.csv"
-    data = manga_list_custom_csv_dict(manga_list)
+    data = manga_list_custom_csv_dict(manga_list, fields)
     if data:
         data_fieldnames = data[0].keys()
         with open(filename, mode="w", encoding="utf-8", newline="") as f:
@@ -27,4 +87,85 @@ def export_manga_list_to_csv(manga_list: MangaList, path_folder: str):
                 escapechar="\\",
             )
             writer.writeheader()
-            writer.writerows(data)
\ No newline at end of file
+            writer.writerows(data)
+
+@METRICS.timed("export_seconds", format="sqlite")
+def export_manga_list_to_sqlite(manga_list: MangaList, path: str):
+    with MangaDatabase(path) as database:
+        database.save_manga_list(manga_list)
+
+class JsonLinesEntryWriter:
+    """
+    Writes one JSON object per manga list entry and flushes at most every
+    `flush_interval` seconds, so the file is usable while the export is still
+    running without compressing each entry on its own.
+    """
+
+    def __init__(self, filename: str, compress: bool = False, fields: Optional[List[str]] = None, backend: str = DEFAULT_JSON_BACKEND, flush_interval: float = STREAM_FLUSH_INTERVAL):
+        self.filename = filename
+        self.fields = fields
+        self.backend = get_json_backend(backend, pretty=False)
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._flushed = time.monotonic()
+        if compress:
+            self._file = gzip.open(filename, "wb")
+        else:
+            self._file = open(filename, "wb")
+
+    @METRICS.timed("export_entry_seconds", format="jsonl")
+    def write(self, manga_list_entry: MangaListEntry):
+        data = manga_list_entry if self.fields is None else manga_list_entry_dict(manga_list_entry, self.fields)
+        self._file.write(encode_json(data, self.backend, pretty=False) + b"\n")
+        self.count += 1
+        now = time.monotonic()
+        if now - self._flushed >= self.flush_interval:
+            self._file.flush()
+            self._flushed = now
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class CsvEntryWriter:
+    """
+    Writes one CSV row per manga list entry and flushes after each one.
+    """
+
+    def __init__(self, filename: str, fields: Optional[List[str]] = None):
+        self.filename = filename
+        self.fields = fields
+        self.count = 0
+        self._file = open(filename, mode="w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(
+            self._file,
+            fieldnames=fields or CSV_FIELDNAMES,
+            quotechar='"',
+            quoting=csv.QUOTE_ALL,
+            escapechar="\\",
+        )
+        self._writer.writeheader()
+        self._file.flush()
+
+    @METRICS.timed("export_entry_seconds", format="csv")
+    def write(self, manga_list_entry: MangaListEntry):
+        self._writer.writerow(manga_list_entry_custom_csv_dict(manga_list_entry, self.fields))
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def get_stream_filename(title: str, path_folder: str, extension: str) -> str:
+    return f"{path_folder}/{sanitize_filename(title)}_{time.strftime('%Y%m%d%H%M%S')}.{extension}"
@@ -0,0 +1,328 @@
+import queue
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Selenium takes longer to import than the rest of the exporter, only load it once Chrome is needed
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+from .config import FETCHER_BACKENDS, PAGE_LOAD_TIMEOUT
+from .metrics import METRICS
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# Class names present on every fully rendered list or manga page
+PAGE_MARKERS = ("w-title", "manga_right")
+
+# Resources the parser never looks at
+BLOCKED_RESOURCE_PATTERNS = (
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css",
+)
+BLOCKED_THIRD_PARTY_DOMAINS = (
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "adservice.google.com", "facebook.net", "facebook.com", "twitter.com",
+    "disqus.com", "disquscdn.com", "addthis.com", "sharethis.com", "scorecardresearch.com",
+    "quantserve.com", "histats.com", "statcounter.com", "adsterra.com", "popads.net", "propellerads.com",
+    "exoclick.com", "juicyads.com", "cloudflareinsights.com",
+)
+
+@dataclass
+class ChromeProfile:
+    headless: bool = True
+    block_resources: bool = True
+    blocked_domains: Tuple[str, ...] = BLOCKED_THIRD_PARTY_DOMAINS
+    disk_cache_dir: Optional[str] = None
+    page_load_timeout: float = PAGE_LOAD_TIMEOUT
+
+    @property
+    def blocked_urls(self) -> List[str]:
+        if not self.block_resources:
+            return []
+        # Patterns must match the whole URL, so also cover query strings
+        resources = [url for pattern in BLOCKED_RESOURCE_PATTERNS for url in (pattern, f"{pattern}?*")]
+        domains = [url for domain in self.blocked_domains for url in (f"*://{domain}/*", f"*://*.{domain}/*")]
+        return resources + domains
+
+class PageLoadTimer:
+    """
+    Thread-safe record of how long each page took to load.
+    """
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def __str__(self):
+        with self._lock:
+            samples = sorted(self.samples)
+        if not samples:
+            return "no pages loaded"
+        p95 = samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))]
+        return f"{len(samples)} pages, mean {statistics.fmean(samples):.2f}s, median {statistics.median(samples):.2f}s, p95 {p95:.2f}s"
+
+class FetchError(Exception):
+    def __init__(self, url: str, status: Optional[int] = None, message: Optional[str] = None, retry_after: Optional[float] = None):
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+        super().__init__(message or f"Failed to fetch {url} (status {status})")
+
+class Fetcher:
+    """
+    Returns the HTML source of a page. Implementations must be safe to call
+    from several threads at once.
+    """
+
+    def fetch(self, url: str) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@METRICS.timed("driver_startup_seconds")
+def create_chrome_driver(profile: Optional[ChromeProfile] = None) -> "webdriver.Chrome":
+    from selenium import webdriver
+
+    profile = profile or ChromeProfile()
+
+    # Set web driver options
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = "eager"
+    if profile.headless:
+        options.add_argument("--headless=new")
+    if profile.block_resources:
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.media_stream": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    if profile.disk_cache_dir:
+        options.add_argument(f"--disk-cache-dir={profile.disk_cache_dir}")
+
+    # Set web driver
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(profile.page_load_timeout)
+
+    # Block images, media, fonts, stylesheets and third-party domains at the network level
+    if profile.blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile.blocked_urls})
+
+    return driver
+
+def is_driver_crashed(e: Exception) -> bool:
+    # Timeouts leave the browser usable, any other driver error means the session is gone
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+
+    return isinstance(e, WebDriverException) and not isinstance(e, TimeoutException)
+
+class DriverPool:
+    """
+    Bounded pool of Chrome drivers shared between worker threads.
+
+    Drivers are started lazily, so a pool of size N only launches as many
+    browsers as there are threads actually asking for one.
+    """
+
+    def __init__(self, size: int = 1, profile: Optional[ChromeProfile] = None):
+        self.size = max(1, size)
+        self.profile = profile
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> "webdriver.Chrome":
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if len(self._drivers) < self.size:
+                        driver = create_chrome_driver(self.profile)
+                        self._drivers.append(driver)
+                        return driver
+                driver = self._idle.get()
+
+            # None marks the slot of a discarded driver, start a new one in its place
+            if driver is not None:
+                return driver
+
+    def _release(self, driver: "webdriver.Chrome"):
+        self._idle.put(driver)
+
+    def _discard(self, driver: "webdriver.Chrome"):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Wake up a thread waiting for a driver
+        self._idle.put(None)
+
+    @contextmanager
+    def driver(self):
+        driver = self._acquire()
+        try:
+            yield driver
+        except Exception as e:
+            # A crashed browser never recovers, later fetches get a fresh one
+            if is_driver_crashed(e):
+                self._discard(driver)
+            else:
+                self._release(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SeleniumFetcher(Fetcher):
+    def __init__(self, size: int = 1, profile: Optional[ChromeProfile] = None):
+        self.pool = DriverPool(size=size, profile=profile)
+        self.load_times = PageLoadTimer()
+
+    def fetch(self, url: str) -> str:
+        with self.pool.driver() as driver:
+            start = time.perf_counter()
+            try:
+                driver.get(url)
+            except Exception:
+                METRICS.increment("page_fetch_errors_total", backend="selenium", status="none")
+                raise
+            elapsed = time.perf_counter() - start
+            self.load_times.record(elapsed)
+            METRICS.observe("page_fetch_seconds", elapsed, backend="selenium")
+            return driver.page_source
+
+    def close(self):
+        self.pool.close()
+
+def decode_response(response: requests.Response) -> str:
+    # Without a charset requests assumes ISO-8859-1 for text/html, which mangles CJK titles
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return response.text
+    try:
+        return response.content.decode("utf-8")
+    except UnicodeDecodeError:
+        response.encoding = response.apparent_encoding
+        return response.text
+
+class HttpFetcher(Fetcher):
+    """
+    Plain HTTP fetcher over a keep-alive connection pool. Only suitable for
+    pages whose content is present in the static HTML.
+    """
+
+    def __init__(self, size: int = 1, timeout: float = PAGE_LOAD_TIMEOUT):
+        self.timeout = timeout
+        self.load_times = PageLoadTimer()
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=max(1, size), pool_maxsize=max(1, size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> str:
+        try:
+            start = time.perf_counter()
+            response = self.session.get(url, timeout=self.timeout)
+            elapsed = time.perf_counter() - start
+            self.load_times.record(elapsed)
+            METRICS.observe("page_fetch_seconds", elapsed, backend="http")
+        except requests.RequestException as e:
+            METRICS.increment("page_fetch_errors_total", backend="http", status="none")
+            raise FetchError(url, message=f"Failed to fetch {url}: {e}") from e
+        METRICS.increment("page_fetch_bytes_total", len(response.content), backend="http")
+        if response.status_code >= 400:
+            METRICS.increment("page_fetch_errors_total", backend="http", status=response.status_code)
+            retry_after = response.headers.get("Retry-After", "")
+            raise FetchError(url, status=response.status_code, retry_after=float(retry_after) if retry_after.isdigit() else None)
+        return decode_response(response)
+
+    def close(self):
+        self.session.close()
+
+def get_page_load_timers(fetcher: Fetcher) -> List[Tuple[str, PageLoadTimer]]:
+    # Walk wrapped fetchers and collect the ones that time their page loads
+    timers = []
+    for inner in (getattr(fetcher, "fetcher", None), getattr(fetcher, "primary", None), getattr(fetcher, "fallback", None)):
+        if inner is not None:
+            timers.extend(get_page_load_timers(inner))
+    if isinstance(getattr(fetcher, "load_times", None), PageLoadTimer):
+        timers.append((type(fetcher).__name__, fetcher.load_times))
+    return timers
+
+def is_page_complete(html: str) -> bool:
+    return any(marker in html for marker in PAGE_MARKERS)
+
+class FallbackFetcher(Fetcher):
+    """
+    Tries the primary fetcher first and falls back to the secondary one when
+    the request fails or the returned page is missing its expected content
+    (e.g. a page that needs JavaScript to render).
+    """
+
+    def __init__(self, primary: Fetcher, fallback: Fetcher, is_complete: Callable[[str], bool] = is_page_complete):
+        self.primary = primary
+        self.fallback = fallback
+        self.is_complete = is_complete
+
+    def fetch(self, url: str) -> str:
+        try:
+            html = self.primary.fetch(url)
+            if self.is_complete(html):
+                return html
+        except FetchError as e:
+            # The site is throttling or failing, a browser would not do better
+            if e.status is not None and (e.status == 429 or e.status >= 500):
+                raise
+        return self.fallback.fetch(url)
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+def create_fetcher(backend: str = "auto", size: int = 1, profile: Optional[ChromeProfile] = None) -> Fetcher:
+    timeout = profile.page_load_timeout if profile else PAGE_LOAD_TIMEOUT
+    if backend == "http":
+        return HttpFetcher(size=size, timeout=timeout)
+    if backend == "selenium":
+        return SeleniumFetcher(size=size, profile=profile)
+    if backend == "auto":
+        return FallbackFetcher(HttpFetcher(size=size, timeout=timeout), SeleniumFetcher(size=size, profile=profile))
+    raise ValueError(f"Unknown fetcher backend '{backend}', expected one of: {', '.join(FETCHER_BACKENDS)}")
@@ -0,0 +1,77 @@
+import glob
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .models import Manga, MangaList, MangaListEntry
+from .utils import has_manga_fields, manga_list_from_dict, sanitize_filename
+
+@dataclass
+class MangaListDiff:
+    title: Optional[str] = None
+    url: Optional[str] = None
+    previous_update: Optional[str] = None
+    last_update: Optional[str] = None
+    added: List[MangaListEntry] = field(default_factory=list)
+    removed: List[MangaListEntry] = field(default_factory=list)
+
+    def __str__(self):
+        return f"{len(self.added)} added, {len(self.removed)} removed"
+
+def load_manga_list_from_json(path) -> Tuple[MangaList, Optional[List[str]]]:
+    # Exports made with --fields record their fields, full exports have none
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    manga_list = manga_list_from_dict(data)
+    # Exports with failed pages or entries lend their manga but never count as up to date,
+    # so the list is fetched again even though its last update has not changed
+    if data.get("partial"):
+        manga_list.last_update = None
+    return manga_list, data.get("fields")
+
+def has_export_fields(export_fields: Optional[List[str]], fields: Optional[List[str]]) -> bool:
+    if export_fields is None:
+        return True
+    return fields is not None and set(fields) <= set(export_fields)
+
+def find_previous_export(path_folder, manga_list: MangaList, fields: Optional[List[str]] = None) -> Optional[MangaList]:
+    # Exports are named "<title>_<timestamp>.json", so the newest sorts last
+    # Titles such as "[BL] faves" would otherwise be read as glob patterns
+    candidates = sorted(Path(path_folder).glob(f"{glob.escape(sanitize_filename(manga_list.title))}_*.json"), reverse=True)
+    for candidate in candidates:
+        if candidate.stem[len(sanitize_filename(manga_list.title)):].startswith("_diff_"):
+            continue
+        try:
+            previous, export_fields = load_manga_list_from_json(candidate)
+        except (OSError, ValueError, TypeError):
+            continue
+        # An export missing some of the requested fields can neither be skipped to nor reused
+        if previous.url == manga_list.url and has_export_fields(export_fields, fields):
+            return previous
+    return None
+
+def is_manga_list_unchanged(previous: Optional[MangaList], manga_list: MangaList) -> bool:
+    return previous is not None and previous.last_update is not None and previous.last_update == manga_list.last_update
+
+def get_known_manga(previous: Optional[MangaList], fields: Optional[List[str]] = None) -> Dict[str, Manga]:
+    if previous is None:
+        return {}
+    # Manga from an export with fewer fields are fetched again
+    return {
+        manga_list_entry.url: manga_list_entry.manga
+        for manga_list_entry in previous.entries
+        if manga_list_entry.url and has_manga_fields(manga_list_entry.manga, fields)
+    }
+
+def diff_manga_lists(previous: MangaList, manga_list: MangaList) -> MangaListDiff:
+    previous_urls = {manga_list_entry.url for manga_list_entry in previous.entries}
+    current_urls = {manga_list_entry.url for manga_list_entry in manga_list.entries}
+    return MangaListDiff(
+        title=manga_list.title,
+        url=manga_list.url,
+        previous_update=previous.last_update,
+        last_update=manga_list.last_update,
+        added=[manga_list_entry for manga_list_entry in manga_list.entries if manga_list_entry.url not in previous_urls],
+        removed=[manga_list_entry for manga_list_entry in previous.entries if manga_list_entry.url not in current_urls],
+    )
@@ -0,0 +1,98 @@
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .models import Manga, MangaList, MangaListEntry
+from .utils import manga_list_entry_from_dict, manga_list_from_dict
+
+@dataclass
+class JournalState:
+    manga_list: MangaList
+    pages: Dict[int, List[MangaListEntry]] = field(default_factory=dict)
+    manga: Dict[str, Manga] = field(default_factory=dict)
+
+    def __str__(self):
+        return f"{len(self.pages)} of {self.manga_list.pages} pages and {len(self.manga)} entries already fetched"
+
+class ExportJournal:
+    """
+    Append-only JSON Lines checkpoint of an export in progress.
+
+    The journal records the manga list info, every list page once its
+    entries are parsed and every entry once its manga details are fetched,
+    so an interrupted export can pick up where it stopped.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._pages = set()
+        self._urls = set()
+
+    def load(self) -> Optional[JournalState]:
+        if not self.path.exists():
+            return None
+
+        state = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Last line may be cut short by a crash
+                    continue
+
+                if record["type"] == "list":
+                    state = JournalState(manga_list=manga_list_from_dict(record["manga_list"]))
+                elif state is None:
+                    continue
+                elif record["type"] == "page":
+                    state.pages[record["page"]] = [manga_list_entry_from_dict(entry_data) for entry_data in record["entries"]]
+                elif record["type"] == "entry":
+                    state.manga[record["url"]] = Manga(**record["manga"])
+
+        if state is not None:
+            state.manga_list.entries = list(state.pages.get(1, []))
+        return state
+
+    def open(self, manga_list: MangaList, state: Optional[JournalState] = None):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if state is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+            data = asdict(manga_list)
+            data["entries"] = []
+            self._write({"type": "list", "manga_list": data})
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._pages = set(state.pages)
+            self._urls = set(state.manga)
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def record_page(self, page: int, manga_list_entries: List[MangaListEntry]):
+        if page in self._pages:
+            return
+        self._pages.add(page)
+        self._write({
+            "type": "page",
+            "page": page,
+            "entries": [{key: value for key, value in asdict(manga_list_entry).items() if key != "manga"} for manga_list_entry in manga_list_entries],
+        })
+
+    def record_entry(self, manga_list_entry: MangaListEntry):
+        if manga_list_entry.manga is None or manga_list_entry.url in self._urls:
+            return
+        self._urls.add(manga_list_entry.url)
+        self._write({"type": "entry", "url": manga_list_entry.url, "manga": asdict(manga_list_entry.manga)})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -1,43 +1,68 @@
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-@dataclass
-class Manga:
+# Values repeated across thousands of entries share one string object
+INTERNED_FIELDS = {"author", "status", "genres", "add_date", "tags"}
+# Collections are stored as tuples, lists assigned to them are converted
+TUPLE_FIELDS = {"genres", "alternatives", "tags"}
+
+def _compact(name: str, value):
+    if value is None:
+        return value
+    if name in TUPLE_FIELDS:
+        if name in INTERNED_FIELDS:
+            return tuple(sys.intern(item) if isinstance(item, str) else item for item in value)
+        return tuple(value)
+    if name in INTERNED_FIELDS and isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+class _Compact:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, _compact(name, value))
+
+@dataclass(slots=True)
+class Manga(_Compact):
     title: Optional[str] = None
     url: Optional[str] = None
     cover_url: Optional[str] = None
+    # Downloaded cover, relative to the cover store folder
+    cover_path: Optional[str] = None
     author: Optional[str] = None
-    genres: List[str] = field(default_factory=list)
-    alternatives: List[str] = field(default_factory=list)
+    genres: Tuple[str, ...] = ()
+    alternatives: Tuple[str, ...] = ()
     summary: Optional[str] = None
     status: Optional[str] = None
     released_year: Optional[int] = None
     rating: Optional[float] = None
     votes: Optional[int] = None
-    
+
     def __str__(self):
         if self.author:
             return f"{self.title} by {self.author}"
         return self.title
 
-@dataclass
-class MangaListEntry:
+@dataclass(slots=True)
+class MangaListEntry(_Compact):
     manga: Optional[Manga] = None
     url: Optional[str] = None
     comment: Optional[str] = None
     add_date: Optional[str] = None
 
-@dataclass
-class MangaList:
+@dataclass(slots=True)
+class MangaList(_Compact):
     title: Optional[str] = None
     url: Optional[str] = None
     creator: Optional[str] = None
     creation_date: Optional[str] = None
     last_update: Optional[str] = None
     description: Optional[str] = None
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     pages: Optional[int] = 1
     entries: List[MangaListEntry] = field(default_factory=list)
 
     def __str__(self):
-        return f"{self.title} by {self.creator} with {len(self.entries)} entries"
\ No newline at end of file
+        return f"{self.title} by {self.creator} with {len(self.entries)} entries"
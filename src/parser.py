@@ -1,32 +1,77 @@
+import importlib.util
 import re
-from typing import List
+from typing import List, Optional
 
-from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
+from .cache import MangaCache
+from .config import DEFAULT_PARSER_BACKEND, MANGAGO_BASE_URL, PARSER_BACKENDS
+from .fetcher import Fetcher
+from .metrics import METRICS
 from .models import Manga, MangaListEntry, MangaList
 from .utils import get_date_from_manga_list_timestamp
 
-MANGA_LIST_URL_WITH_PAGE = "https://www.mangago.me/home/mangalist/{manga_list_code}/?filter=&page={page_no}"
+MANGA_LIST_URL_WITH_PAGE = MANGAGO_BASE_URL + "/home/mangalist/{manga_list_code}/?filter=&page={page_no}"
 
-def get_manga_list_entries(driver: webdriver.Chrome, code: str, page: int) -> List[MangaListEntry]: 
-    url = MANGA_LIST_URL_WITH_PAGE.format(manga_list_code=code, page_no=page)
-    driver.get(url)
-    manga_list_page_soup = BeautifulSoup(driver.page_source, "html.parser")
-    manga_list_entries = parse_manga_list_entries(manga_list_page_soup)
-    return manga_list_entries
+# Only build the parts of the page the parse functions look at. Class values are
+# still raw strings while parsing, hence the regular expressions.
+MANGA_LIST_ENTRIES_STRAINER = SoupStrainer(attrs={"class": re.compile(r"(^|\s)note-and-order(\s|$)")})
+MANGA_STRAINER = SoupStrainer(attrs={"class": re.compile(r"(^|\s)(w-title|cover|manga_right|manga_summary)(\s|$)")})
+
+def check_parser_backend(backend: str):
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}', expected one of: {', '.join(PARSER_BACKENDS)}")
+    if backend == "lxml" and importlib.util.find_spec("lxml") is None:
+        raise ValueError("Parser backend 'lxml' needs the lxml package: pip install lxml")
+
+def make_soup(html: str, backend: str = DEFAULT_PARSER_BACKEND, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    with METRICS.timed("soup_seconds", backend=backend, strained=parse_only is not None):
+        return BeautifulSoup(html, backend, parse_only=parse_only)
+
+def make_manga_list_entries_soup(html: str, backend: str = DEFAULT_PARSER_BACKEND) -> BeautifulSoup:
+    return make_soup(html, backend, MANGA_LIST_ENTRIES_STRAINER)
+
+def make_manga_soup(html: str, backend: str = DEFAULT_PARSER_BACKEND) -> BeautifulSoup:
+    soup = make_soup(html, backend, MANGA_STRAINER)
+    # Title or rating outside the expected containers, build the whole page instead
+    if (soup.find("h1") is None and "<h1" in html) or (soup.select_one("span.rating_num") is None and "rating_num" in html):
+        soup = make_soup(html, backend)
+    return soup
+
+def get_manga_list_url(code: str, page: int) -> str:
+    return MANGA_LIST_URL_WITH_PAGE.format(manga_list_code=code, page_no=page)
 
-def get_manga(driver: webdriver.Chrome, url: str) -> Manga:
-    driver.get(url)
-    manga_soup = BeautifulSoup(driver.page_source, "html.parser")
-    manga = parse_manga(manga_soup)
+# Module level so they can be sent to a process pool
+def parse_manga_list_entries_html(html: str, parser: str = DEFAULT_PARSER_BACKEND) -> List[MangaListEntry]:
+    return parse_manga_list_entries(make_manga_list_entries_soup(html, parser))
+
+def parse_manga_html(html: str, url: str, parser: str = DEFAULT_PARSER_BACKEND) -> Manga:
+    manga = parse_manga(make_manga_soup(html, parser))
     manga.url = url
     return manga
 
-def set_manga_for_manga_list_entry(driver: webdriver.Chrome, manga_list_entry: MangaListEntry):
-    manga = get_manga(driver, manga_list_entry.url)
+def get_manga_list_entries(fetcher: Fetcher, code: str, page: int, parser: str = DEFAULT_PARSER_BACKEND) -> List[MangaListEntry]: 
+    url = get_manga_list_url(code, page)
+    return parse_manga_list_entries_html(fetcher.fetch(url), parser)
+
+def get_manga(fetcher: Fetcher, url: str, cache: Optional[MangaCache] = None, parser: str = DEFAULT_PARSER_BACKEND) -> Manga:
+    # Check cache before hitting the network
+    if cache is not None:
+        manga = cache.get(url)
+        if manga is not None:
+            return manga
+
+    manga = parse_manga_html(fetcher.fetch(url), url, parser)
+
+    if cache is not None:
+        cache.put(manga)
+    return manga
+
+def set_manga_for_manga_list_entry(fetcher: Fetcher, manga_list_entry: MangaListEntry, cache: Optional[MangaCache] = None, parser: str = DEFAULT_PARSER_BACKEND):
+    manga = get_manga(fetcher, manga_list_entry.url, cache, parser)
     manga_list_entry.manga = manga
 
+@METRICS.timed("parse_seconds", function="parse_manga_list_info")
 def parse_manga_list_info(soup: BeautifulSoup):
     # Initialize manga list
     manga_list = MangaList()
@@ -71,6 +116,7 @@ def parse_manga_list_info(soup: BeautifulSoup):
 
     return manga_list
 
+@METRICS.timed("parse_seconds", function="parse_manga_list_entries")
 def parse_manga_list_entries(soup: BeautifulSoup):
     manga_list_entries = []
 
@@ -102,6 +148,7 @@ def parse_manga_list_entries(soup: BeautifulSoup):
 
     return manga_list_entries
 
+@METRICS.timed("parse_seconds", function="parse_manga")
 def parse_manga(soup: BeautifulSoup):
     # Initialize manga
     manga = Manga()
@@ -0,0 +1,208 @@
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional
+
+from .cache import MangaCache
+from .config import DEFAULT_WORKERS
+from .fetcher import Fetcher
+from .metrics import METRICS
+from .models import Manga, MangaList, MangaListEntry
+from .parser import DEFAULT_PARSER_BACKEND, get_manga_list_url, parse_manga_html, parse_manga_list_entries_html, set_manga_for_manga_list_entry
+
+_PAGE_DONE = "page"
+_PAGE_FAILED = "page_failed"
+_ENTRY_DONE = "entry"
+
+# Entries waiting for each detail worker before list pages stop being fetched ahead
+ENTRIES_AHEAD_PER_WORKER = 8
+
+def create_parse_executor(parse_workers: int) -> ProcessPoolExecutor:
+    # Spawn rather than fork, the pipeline already has fetcher threads running
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _parse_in_process(parse: Callable, *args):
+    # Timings recorded in a parse worker are sent back with its result
+    result = parse(*args)
+    return result, METRICS.drain()
+
+def _parsed(future: Future):
+    result, metrics = future.result()
+    METRICS.merge(*metrics)
+    return result
+
+def _fetch_page(fetcher: Fetcher, code: str, page: int, parser: str, parse_executor: Optional[Executor], events: queue.Queue):
+    # Transient errors are retried by the fetcher, a page failing here is reported on its own so it never truncates the list
+    try:
+        html = fetcher.fetch(get_manga_list_url(code, page))
+        if parse_executor is None:
+            events.put((_PAGE_DONE, page, parse_manga_list_entries_html(html, parser)))
+            return
+    except Exception as e:
+        events.put((_PAGE_FAILED, page, e))
+        return
+
+    # Hand parsing over to the process pool and free this thread for the next fetch
+    def on_parsed(future: Future):
+        try:
+            events.put((_PAGE_DONE, page, _parsed(future)))
+        except Exception as e:
+            events.put((_PAGE_FAILED, page, e))
+
+    parse_executor.submit(_parse_in_process, parse_manga_list_entries_html, html, parser).add_done_callback(on_parsed)
+
+def _fetch_detail(fetcher: Fetcher, manga_list_entry: MangaListEntry, cache: Optional[MangaCache], parser: str, parse_executor: Optional[Executor], events: queue.Queue):
+    try:
+        if parse_executor is None:
+            set_manga_for_manga_list_entry(fetcher, manga_list_entry, cache, parser)
+            events.put((_ENTRY_DONE, manga_list_entry, None))
+            return
+
+        manga = cache.get(manga_list_entry.url) if cache is not None else None
+        if manga is not None:
+            manga_list_entry.manga = manga
+            events.put((_ENTRY_DONE, manga_list_entry, None))
+            return
+
+        html = fetcher.fetch(manga_list_entry.url)
+    except Exception as e:
+        events.put((_ENTRY_DONE, manga_list_entry, e))
+        return
+
+    # Hand parsing over to the process pool and free this thread for the next fetch
+    def on_parsed(future: Future):
+        try:
+            manga_list_entry.manga = _parsed(future)
+            if cache is not None:
+                cache.put(manga_list_entry.manga)
+            events.put((_ENTRY_DONE, manga_list_entry, None))
+        except Exception as e:
+            events.put((_ENTRY_DONE, manga_list_entry, e))
+
+    parse_executor.submit(_parse_in_process, parse_manga_html, html, manga_list_entry.url, parser).add_done_callback(on_parsed)
+
+def export_manga_list_pipelined(
+    fetcher: Fetcher,
+    manga_list: MangaList,
+    code: str,
+    workers: int = DEFAULT_WORKERS,
+    page_workers: Optional[int] = None,
+    cache: Optional[MangaCache] = None,
+    parser: str = DEFAULT_PARSER_BACKEND,
+    parse_executor: Optional[Executor] = None,
+    known_manga: Optional[Dict[str, Manga]] = None,
+    known_pages: Optional[Dict[int, List[MangaListEntry]]] = None,
+    fetch_details: bool = True,
+    keep_entries: bool = True,
+    on_page: Optional[Callable[[int, List[MangaListEntry]], None]] = None,
+    on_entry: Optional[Callable[[MangaListEntry], None]] = None,
+    on_page_error: Optional[Callable[[int, Exception], None]] = None,
+    on_entry_error: Optional[Callable[[MangaListEntry, Exception], None]] = None,
+) -> MangaList:
+    """
+    Paginate a manga list and fetch manga details at the same time.
+
+    `manga_list` is expected to come from the first list page, with its
+    entries already parsed. Remaining pages 2..N are fetched concurrently by
+    `page_workers` threads (defaults to `workers`), and every entry found is
+    queued for detail fetching straight away. With a `parse_executor` from
+    `create_parse_executor`, HTML is parsed in worker processes while fetcher
+    threads move on to the next page.
+
+    Pages in `known_pages` and entries whose URL is in `known_manga` are
+    reused instead of being fetched. Without `fetch_details` only the list
+    pages are fetched and entries are reported as soon as their page is
+    parsed. Entries are reassembled in page order once everything has
+    finished. Without `keep_entries` they are only handed to the callbacks and
+    `manga_list.entries` is left empty. List pages are only fetched ahead
+    while fewer than `ENTRIES_AHEAD_PER_WORKER` entries per worker wait for
+    their details, so memory does not grow with the list. Callbacks run on
+    the calling thread.
+    """
+    events = queue.Queue()
+    entries_by_page: Dict[int, List[MangaListEntry]] = {1: list(manga_list.entries)}
+    if not keep_entries:
+        manga_list.entries = []
+    pages = deque()
+    for page in range(2, (manga_list.pages or 1) + 1):
+        if known_pages and page in known_pages:
+            entries_by_page[page] = known_pages[page]
+        else:
+            pages.append(page)
+    backlog = deque()
+    max_backlog = max(1, workers) * ENTRIES_AHEAD_PER_WORKER
+    pending_entries = 0
+    pending_pages = 0
+
+    with ExitStack() as stack:
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, workers)))
+        page_executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, page_workers or workers)))
+
+        def submit(manga_list_entries: List[MangaListEntry]):
+            nonlocal pending_entries
+            for manga_list_entry in manga_list_entries:
+                if not fetch_details:
+                    if on_entry:
+                        on_entry(manga_list_entry)
+                    continue
+                if known_manga and manga_list_entry.url in known_manga:
+                    manga_list_entry.manga = known_manga[manga_list_entry.url]
+                    if on_entry:
+                        on_entry(manga_list_entry)
+                    continue
+                backlog.append(manga_list_entry)
+
+        def schedule():
+            # Only keep every worker busy, queued futures would otherwise hold the whole list
+            nonlocal pending_entries, pending_pages
+            while backlog and pending_entries < 2 * max(1, workers):
+                executor.submit(_fetch_detail, fetcher, backlog.popleft(), cache, parser, parse_executor, events)
+                pending_entries += 1
+            while pages and pending_pages < max(1, page_workers or workers) and len(backlog) < max_backlog:
+                page_executor.submit(_fetch_page, fetcher, code, pages.popleft(), parser, parse_executor, events)
+                pending_pages += 1
+
+        try:
+            for page in sorted(entries_by_page):
+                if on_page:
+                    on_page(page, entries_by_page[page])
+                submit(entries_by_page[page])
+            if not keep_entries:
+                entries_by_page.clear()
+
+            schedule()
+            while pending_pages or pending_entries:
+                kind, subject, result = events.get()
+                if kind == _PAGE_DONE:
+                    pending_pages -= 1
+                    if keep_entries:
+                        entries_by_page[subject] = result
+                    if on_page:
+                        on_page(subject, result)
+                    submit(result)
+                elif kind == _PAGE_FAILED:
+                    pending_pages -= 1
+                    if on_page_error:
+                        on_page_error(subject, result)
+                elif kind == _ENTRY_DONE:
+                    pending_entries -= 1
+                    if result is not None and on_entry_error:
+                        on_entry_error(subject, result)
+                    elif result is None and on_entry:
+                        on_entry(subject)
+                schedule()
+        except BaseException:
+            # Drop queued fetches so a failing callback or Ctrl+C returns right away
+            executor.shutdown(wait=False, cancel_futures=True)
+            page_executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    if keep_entries:
+        manga_list.entries = [
+            manga_list_entry
+            for page in sorted(entries_by_page)
+            for manga_list_entry in entries_by_page[page]
+        ]
+    return manga_list
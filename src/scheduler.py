@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+from .config import DEFAULT_MAX_RETRIES, DEFAULT_RATE
+from .fetcher import FetchError, Fetcher
+RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504, 520, 521, 522, 523, 524)
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    throttled: int = 0
+    circuit_opened: int = 0
+
+    def __str__(self):
+        return f"{self.requests} requests, {self.retries} retries, {self.failures} failures ({self.throttled} throttled), circuit opened {self.circuit_opened} times"
+
+class RequestScheduler:
+    """
+    Shared request budget for every page fetch.
+
+    Requests are spaced to stay under `rate` requests per second. Each success
+    nudges the rate back up towards that budget, while a failure or an error
+    rate above `error_threshold` over the last `window` requests halves it.
+    After `breaker_failures` consecutive failures the circuit opens and all
+    requests wait `breaker_cooldown` seconds before trying again.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        min_rate: float = 0.2,
+        increase: float = 0.1,
+        window: int = 50,
+        error_threshold: float = 0.2,
+        breaker_failures: int = 10,
+        breaker_cooldown: float = 60.0,
+    ):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.increase = increase
+        self.error_threshold = error_threshold
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.stats = SchedulerStats()
+        self._outcomes = deque(maxlen=window)
+        self._consecutive_failures = 0
+        self._next_slot = 0.0
+        self._circuit_open_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot, self._circuit_open_until)
+            self._next_slot = slot + 1 / self.rate
+            self.stats.requests += 1
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self._outcomes.append(True)
+            self._consecutive_failures = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_failure(self, throttled: bool = False, retry_after: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append(False)
+            self._consecutive_failures += 1
+            self.stats.failures += 1
+            if throttled:
+                self.stats.throttled += 1
+
+            errors = self._outcomes.count(False) / len(self._outcomes)
+            if throttled or errors > self.error_threshold:
+                self.rate = max(self.min_rate, self.rate / 2)
+
+            now = time.monotonic()
+            if retry_after:
+                self._next_slot = max(self._next_slot, now + retry_after)
+            if self._consecutive_failures >= self.breaker_failures and self._circuit_open_until <= now:
+                self._circuit_open_until = now + self.breaker_cooldown
+                self._consecutive_failures = 0
+                self.stats.circuit_opened += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.stats.retries += 1
+
+    def backoff(self, attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+        # Full jitter exponential backoff
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def is_retryable(e: Exception) -> bool:
+    if isinstance(e, FetchError):
+        return e.status is None or e.status in RETRY_STATUSES
+    # Browser timeouts and crashed drivers, not a chromedriver that cannot start at all
+    if not type(e).__module__.startswith("selenium."):
+        return False
+    from selenium.common.exceptions import NoSuchDriverException, SessionNotCreatedException, WebDriverException
+
+    return isinstance(e, WebDriverException) and not isinstance(e, (NoSuchDriverException, SessionNotCreatedException))
+
+def is_site_failure(e: Exception) -> bool:
+    # Missing or forbidden pages and local errors say nothing about how hard the site is being hit
+    if isinstance(e, FetchError):
+        return e.status is None or e.status >= 500 or e.status in RETRY_STATUSES
+    return is_retryable(e)
+
+class ScheduledFetcher(Fetcher):
+    """
+    Sends every fetch through a RequestScheduler and retries timeouts,
+    throttling and server errors with jittered exponential backoff. Client
+    errors such as 404 and local errors are raised right away without
+    slowing the scheduler.
+    """
+
+    def __init__(self, fetcher: Fetcher, scheduler: Optional[RequestScheduler] = None, max_retries: int = DEFAULT_MAX_RETRIES):
+        self.fetcher = fetcher
+        self.scheduler = scheduler or RequestScheduler()
+        self.max_retries = max_retries
+
+    def fetch(self, url: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            self.scheduler.acquire()
+            try:
+                html = self.fetcher.fetch(url)
+            except Exception as e:
+                if not is_site_failure(e):
+                    raise
+                status = e.status if isinstance(e, FetchError) else None
+                retry_after = e.retry_after if isinstance(e, FetchError) else None
+                self.scheduler.record_failure(throttled=status == 429, retry_after=retry_after)
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                self.scheduler.record_retry()
+                time.sleep(self.scheduler.backoff(attempt))
+                continue
+
+            self.scheduler.record_success()
+            return html
+
+    def close(self):
+        self.fetcher.close()
@@ -1,31 +1,109 @@
 import re
+from dataclasses import asdict
 from datetime import datetime, timedelta
+from typing import List, Optional
 
-from .models import MangaList
-
-def manga_list_custom_csv_dict(manga_list: MangaList) -> dict:
-    csv_dict = []
-    for manga_list_entry in manga_list.entries:
-        entry = {}
-        # Manga details
-        entry["manga_title"] = manga_list_entry.manga.title if manga_list_entry.manga else None
-        entry["manga_url"] = manga_list_entry.manga.url if manga_list_entry.manga else None
-        entry["manga_cover_url"] = manga_list_entry.manga.cover_url if manga_list_entry.manga else None
-        entry["manga_author"] = manga_list_entry.manga.author if manga_list_entry.manga else None
-        entry["manga_genres"] = manga_list_entry.manga.genres if manga_list_entry.manga else None
-        entry["manga_alternatives"] = manga_list_entry.manga.alternatives if manga_list_entry.manga else None
-        entry["manga_summary"] = manga_list_entry.manga.summary.replace("\n", " ") if manga_list_entry.manga and manga_list_entry.manga.summary else None
-        entry["manga_status"] = manga_list_entry.manga.status if manga_list_entry.manga else None
-        entry["manga_released_year"] = manga_list_entry.manga.released_year if manga_list_entry.manga else None
-        entry["manga_rating"] = manga_list_entry.manga.rating if manga_list_entry.manga else None
-        entry["manga_votes"] = manga_list_entry.manga.votes if manga_list_entry.manga else None
-        # Entry details
-        entry["entry_comment"] = manga_list_entry.comment.replace("\n", " ") if manga_list_entry.comment else None
-        entry["entry_add_date"] = manga_list_entry.add_date
-        
-        csv_dict.append(entry)
-    
-    return csv_dict
+from .models import Manga, MangaList, MangaListEntry
+
+def manga_list_entry_custom_csv_dict(manga_list_entry: MangaListEntry, fields: Optional[List[str]] = None) -> dict:
+    entry = {}
+    # Manga details
+    entry["manga_title"] = manga_list_entry.manga.title if manga_list_entry.manga else None
+    entry["manga_url"] = manga_list_entry.manga.url if manga_list_entry.manga else None
+    entry["manga_cover_url"] = manga_list_entry.manga.cover_url if manga_list_entry.manga else None
+    entry["manga_cover_path"] = manga_list_entry.manga.cover_path if manga_list_entry.manga else None
+    entry["manga_author"] = manga_list_entry.manga.author if manga_list_entry.manga else None
+    entry["manga_genres"] = list(manga_list_entry.manga.genres) if manga_list_entry.manga else None
+    entry["manga_alternatives"] = list(manga_list_entry.manga.alternatives) if manga_list_entry.manga else None
+    entry["manga_summary"] = manga_list_entry.manga.summary.replace("\n", " ") if manga_list_entry.manga and manga_list_entry.manga.summary else None
+    entry["manga_status"] = manga_list_entry.manga.status if manga_list_entry.manga else None
+    entry["manga_released_year"] = manga_list_entry.manga.released_year if manga_list_entry.manga else None
+    entry["manga_rating"] = manga_list_entry.manga.rating if manga_list_entry.manga else None
+    entry["manga_votes"] = manga_list_entry.manga.votes if manga_list_entry.manga else None
+    # Entry details
+    entry["entry_comment"] = manga_list_entry.comment.replace("\n", " ") if manga_list_entry.comment else None
+    entry["entry_add_date"] = manga_list_entry.add_date
+
+    if fields is None:
+        return entry
+
+    # Only selected fields, in the requested order
+    entry["entry_url"] = manga_list_entry.url
+    return {field: entry[field] for field in fields}
+
+def manga_list_custom_csv_dict(manga_list: MangaList, fields: Optional[List[str]] = None) -> dict:
+    return [manga_list_entry_custom_csv_dict(manga_list_entry, fields) for manga_list_entry in manga_list.entries]
+
+CSV_FIELDNAMES = list(manga_list_entry_custom_csv_dict(MangaListEntry()).keys())
+EXPORT_FIELDS = CSV_FIELDNAMES + ["entry_url"]
+# Fields only found on list pages, everything else needs the manga page
+LIST_PAGE_FIELDS = ["entry_url", "entry_comment", "entry_add_date"]
+
+def check_fields(fields: List[str]):
+    if not fields:
+        raise ValueError("Select at least one field")
+    unknown_fields = [field for field in fields if field not in EXPORT_FIELDS]
+    if unknown_fields:
+        raise ValueError(f"Unknown field(s) {', '.join(unknown_fields)}, expected any of: {', '.join(EXPORT_FIELDS)}")
+
+def get_manga_attributes(fields: Optional[List[str]]) -> List[str]:
+    # Manga attributes behind the selected fields, all of them when nothing is selected
+    if fields is None:
+        return [field[len("manga_"):] for field in CSV_FIELDNAMES if field.startswith("manga_")]
+    return [field[len("manga_"):] for field in fields if field.startswith("manga_")]
+
+def needs_manga_details(fields: Optional[List[str]]) -> bool:
+    return bool(get_manga_attributes(fields))
+
+def has_manga_fields(manga: Optional[Manga], fields: Optional[List[str]]) -> bool:
+    # Full exports reuse any known manga
+    if manga is None or fields is None:
+        return manga is not None
+    return all(getattr(manga, attribute) is not None for attribute in get_manga_attributes(fields))
+
+def manga_list_entry_dict(manga_list_entry: MangaListEntry, fields: Optional[List[str]] = None) -> dict:
+    if fields is None:
+        return asdict(manga_list_entry)
+
+    # Same layout as the full export, without the fields that were not selected
+    entry = {}
+    manga_attributes = get_manga_attributes(fields)
+    if manga_attributes:
+        manga = manga_list_entry.manga
+        entry["manga"] = {attribute: getattr(manga, attribute) for attribute in manga_attributes} if manga else None
+    for field in fields:
+        if field in LIST_PAGE_FIELDS:
+            attribute = field[len("entry_"):]
+            entry[attribute] = getattr(manga_list_entry, attribute)
+    return entry
+
+def manga_list_dict(manga_list: MangaList, fields: Optional[List[str]] = None, partial: bool = False) -> dict:
+    if fields is None and not partial:
+        return asdict(manga_list)
+
+    data = {key: getattr(manga_list, key) for key in manga_list.__dataclass_fields__ if key != "entries"}
+    # Recorded so incremental exports know which fields this export is missing
+    if fields is not None:
+        data["fields"] = list(fields)
+    # Recorded so incremental exports fetch the failed pages and entries again
+    if partial:
+        data["partial"] = True
+    data["entries"] = [manga_list_entry_dict(manga_list_entry, fields) for manga_list_entry in manga_list.entries]
+    return data
+
+def manga_list_entry_from_dict(data: dict) -> MangaListEntry:
+    manga_data = data.get("manga")
+    return MangaListEntry(
+        manga=Manga(**manga_data) if manga_data else None,
+        url=data.get("url"),
+        comment=data.get("comment"),
+        add_date=data.get("add_date"),
+    )
+
+def manga_list_from_dict(data: dict) -> MangaList:
+    manga_list = MangaList(**{key: value for key, value in data.items() if key not in ("entries", "fields", "partial")})
+    manga_list.entries = [manga_list_entry_from_dict(entry_data) for entry_data in data.get("entries") or []]
+    return manga_list
 
 def get_date_from_manga_list_timestamp(text: str) -> str:
     # Get current datetime
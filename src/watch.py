@@ -0,0 +1,270 @@
+import hashlib
+import heapq
+import json
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .config import DEFAULT_MAX_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL, DEFAULT_PARSER_BACKEND, DEFAULT_WATCH_BUDGET
+from .fetcher import Fetcher
+from .metrics import METRICS
+from .models import MangaList
+from .parser import get_manga_list_url, make_soup, parse_manga_list_entries, parse_manga_list_info
+
+# Every list is assumed to change about once a day until it has been watched for a while
+PRIOR_CHANGES = 1
+PRIOR_SECONDS = 24 * 60 * 60
+
+@dataclass
+class WatchStats:
+    polls: int = 0
+    changes: int = 0
+    synced: int = 0
+    failures: int = 0
+
+    def __str__(self):
+        return f"{self.polls} polls, {self.changes} changes, {self.synced} synced, {self.failures} failures"
+
+@dataclass
+class WatchedList:
+    code: str
+    # Last polled and last exported state of the first page
+    signature: Optional[str] = None
+    exported_signature: Optional[str] = None
+    last_update: Optional[str] = None
+    first_polled: Optional[float] = None
+    last_polled: Optional[float] = None
+    last_changed: Optional[float] = None
+    next_poll: float = 0.0
+    interval: float = DEFAULT_MIN_POLL_INTERVAL
+    polls: int = 0
+    changes: int = 0
+    failures: int = 0
+    # Requests spent by the last export of this list, 0 until it is exported
+    export_cost: int = 0
+
+    def change_rate(self, now: float) -> float:
+        # Changes per second, observed changes on top of the prior
+        observed = now - self.first_polled if self.first_polled is not None else 0.0
+        return (self.changes + PRIOR_CHANGES) / (observed + PRIOR_SECONDS)
+
+class RequestBudget:
+    """
+    Token bucket of page requests per hour shared by polls and exports.
+
+    Up to `burst` requests go out at once, after that every request waits for
+    its share of the hourly budget.
+    """
+
+    def __init__(self, requests_per_hour: float = DEFAULT_WATCH_BUDGET, burst: Optional[float] = None):
+        self.rate = requests_per_hour / 3600
+        self.burst = burst if burst is not None else max(1.0, min(requests_per_hour / 60, 60.0))
+        self.spent = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.spent += 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+class BudgetedFetcher(Fetcher):
+    """
+    Takes every page fetch, retries included, out of a RequestBudget.
+    """
+
+    def __init__(self, fetcher: Fetcher, budget: RequestBudget):
+        self.fetcher = fetcher
+        self.budget = budget
+
+    def fetch(self, url: str) -> str:
+        self.budget.acquire()
+        return self.fetcher.fetch(url)
+
+    def close(self):
+        self.fetcher.close()
+
+def get_manga_list_signature(manga_list: MangaList) -> str:
+    # Same day updates do not change last_update, so the first page entries are compared too
+    entry_urls = "\n".join(manga_list_entry.url or "" for manga_list_entry in manga_list.entries)
+    digest = hashlib.sha1(entry_urls.encode("utf-8")).hexdigest()
+    return f"{manga_list.last_update}|{manga_list.pages}|{digest}"
+
+def is_manga_list_exported(previous: Optional[MangaList], manga_list: MangaList) -> bool:
+    # Exports keep list order, so an up to date export starts with the polled first page.
+    # Partial exports are loaded without a last update and never match.
+    if previous is None or previous.last_update != manga_list.last_update or previous.pages != manga_list.pages:
+        return False
+    previous_urls = [manga_list_entry.url for manga_list_entry in previous.entries[:len(manga_list.entries)]]
+    return previous_urls == [manga_list_entry.url for manga_list_entry in manga_list.entries]
+
+def poll_manga_list(fetcher: Fetcher, code: str, parser: str = DEFAULT_PARSER_BACKEND) -> MangaList:
+    # Page 1 holds the list info and its first entries, exports start from it
+    manga_list_url = get_manga_list_url(code, 1)
+    soup = make_soup(fetcher.fetch(manga_list_url), parser)
+    manga_list = parse_manga_list_info(soup)
+    manga_list.url = manga_list_url
+    manga_list.entries = parse_manga_list_entries(soup)
+    return manga_list
+
+class ListWatcher:
+    """
+    Keeps many manga lists in sync within a request budget.
+
+    Each list is polled by fetching its first page, and `on_change` is called
+    with that page's manga list until the state of its last update, page count
+    and first entries has been exported, which `on_change` reports by
+    returning True. Exports are expected to go through the same budgeted
+    fetcher, so their requests are counted too.
+
+    Lists that change often are polled more often. Poll intervals follow the
+    square root of each list's change rate, which keeps the lists fresher
+    than polling all of them equally for the same number of requests. They
+    are scaled to the budget left after the expected cost of re-exports and
+    kept between `min_interval` and `max_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        codes: List[str],
+        fetcher: Fetcher,
+        budget: RequestBudget,
+        on_change: Callable[[str, MangaList], bool],
+        parser: str = DEFAULT_PARSER_BACKEND,
+        min_interval: float = DEFAULT_MIN_POLL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+        state_path=None,
+        on_poll: Optional[Callable[[WatchedList, Optional[Exception]], None]] = None,
+    ):
+        self.fetcher = fetcher
+        self.budget = budget
+        self.on_change = on_change
+        self.on_poll = on_poll
+        self.parser = parser
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.state_path = Path(state_path) if state_path else None
+        self.stats = WatchStats()
+
+        saved = self.load_state()
+        now = time.time()
+        self.lists: Dict[str, WatchedList] = {}
+        for index, code in enumerate(codes):
+            watched_list = saved.get(code)
+            if watched_list is None:
+                # Spread first polls of new lists over the shortest interval
+                watched_list = WatchedList(code=code, next_poll=now + min_interval * index / max(1, len(codes)))
+            self.lists[code] = watched_list
+        self.plan()
+        self._queue = [(watched_list.next_poll, code) for code, watched_list in self.lists.items()]
+        heapq.heapify(self._queue)
+
+    def load_state(self) -> Dict[str, WatchedList]:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {code: WatchedList(**fields) for code, fields in data.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save_state(self):
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps({code: asdict(watched_list) for code, watched_list in self.lists.items()}, indent=4)
+        # Replace in one step so an interrupted watch never leaves a half written state
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(self.state_path)
+
+    def get_poll_rate(self, now: float) -> float:
+        # Polls per second left once expected re-exports are paid for, never less than a tenth of the budget
+        known_costs = [watched_list.export_cost for watched_list in self.lists.values() if watched_list.export_cost]
+        default_cost = sum(known_costs) / len(known_costs) if known_costs else 0
+        export_rate = sum(watched_list.change_rate(now) * (watched_list.export_cost or default_cost) for watched_list in self.lists.values())
+        return max(self.budget.rate - export_rate, self.budget.rate / 10)
+
+    def plan(self):
+        now = time.time()
+        poll_rate = self.get_poll_rate(now)
+        weights = {code: math.sqrt(watched_list.change_rate(now)) for code, watched_list in self.lists.items()}
+        total_weight = sum(weights.values())
+        for code, watched_list in self.lists.items():
+            interval = total_weight / (poll_rate * weights[code])
+            watched_list.interval = min(self.max_interval, max(self.min_interval, interval))
+
+    def poll(self, watched_list: WatchedList):
+        now = time.time()
+        watched_list.polls += 1
+        watched_list.last_polled = now
+        if watched_list.first_polled is None:
+            watched_list.first_polled = now
+        self.stats.polls += 1
+        METRICS.increment("watch_polls_total")
+
+        try:
+            manga_list = poll_manga_list(self.fetcher, watched_list.code, self.parser)
+        except Exception as e:
+            watched_list.failures += 1
+            self.stats.failures += 1
+            METRICS.increment("watch_poll_errors_total")
+            if self.on_poll:
+                self.on_poll(watched_list, e)
+            return
+
+        signature = get_manga_list_signature(manga_list)
+        # The first poll only sets the baseline, it says nothing about how often the list changes
+        if watched_list.signature is not None and signature != watched_list.signature:
+            watched_list.changes += 1
+            watched_list.last_changed = now
+            self.stats.changes += 1
+            METRICS.increment("watch_changes_total")
+        watched_list.signature = signature
+        watched_list.last_update = manga_list.last_update
+        if self.on_poll:
+            self.on_poll(watched_list, None)
+        if signature == watched_list.exported_signature:
+            return
+
+        # Failed exports are tried again on the next poll
+        spent = self.budget.spent
+        exported = self.on_change(watched_list.code, manga_list)
+        # Lists found already exported cost nothing, keep the cost of their last real export
+        if self.budget.spent > spent:
+            watched_list.export_cost = self.budget.spent - spent
+        if exported:
+            watched_list.exported_signature = signature
+            self.stats.synced += 1
+
+    def run(self, max_polls: Optional[int] = None):
+        polls = 0
+        while self._queue and (max_polls is None or polls < max_polls):
+            next_poll, code = heapq.heappop(self._queue)
+            delay = next_poll - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            watched_list = self.lists[code]
+            self.poll(watched_list)
+            polls += 1
+
+            self.plan()
+            watched_list.next_poll = time.time() + watched_list.interval
+            heapq.heappush(self._queue, (watched_list.next_poll, code))
+            self.save_state()